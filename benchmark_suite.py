@@ -0,0 +1,160 @@
+"""Scale benchmarks for FamilyTree on synthetic genealogies, with regression tracking.
+
+    python benchmark_suite.py --sizes 100000 1000000 --record results.json
+    python benchmark_suite.py --sizes 100000 1000000 --compare results.json
+
+Every query and I/O path is timed (median over samples) and then re-run once
+under tracemalloc for its peak allocation. ``--record`` writes the numbers as
+JSON; ``--compare`` prints the ratio against such a file and exits non-zero
+if anything got slower than ``--tolerance`` allows.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from got import FamilyTree
+from kinship import KinshipCoefficients
+from synthetic_tree import synthetic_adjacency
+
+
+def measure(fn: Callable, samples: List[tuple]) -> Dict[str, float]:
+    """Median seconds of ``fn(*args)`` over ``samples``, plus the peak bytes of one traced call."""
+    times = []
+    for args in samples:
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    fn(*samples[0])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": statistics.median(times), "peak_bytes": peak, "samples": len(samples)}
+
+
+def run_size(people: int, args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    rng = random.Random(args.seed)
+
+    def record(label: str, fn: Callable, samples: List[tuple]):
+        results[label] = measure(fn, samples)
+        r = results[label]
+        print(f"  {label:<30} {r['seconds'] * 1e3:>11.3f} ms {r['peak_bytes'] / 2 ** 20:>10.1f} MiB")
+
+    print(f"\n{people:,} people (depth={args.depth}, branching={args.branching}, collapse={args.collapse})")
+    names, parents = synthetic_adjacency(people, args.depth, args.branching, args.collapse, seed=args.seed)
+    record("build from_adjacency", FamilyTree.from_adjacency, [(names, parents)])
+    tree = FamilyTree.from_adjacency(names, parents)
+
+    n = args.queries
+    people_sample = [(names[rng.randrange(people)],) for _ in range(n)]
+    # Uniform samples are mostly recent people; founders' lines are the expensive descendant walks.
+    early = [x for x in names[:max(1, people // 10)] if tree.get_generation(x) <= 2] or names
+    early_sample = [(rng.choice(early),) for _ in range(n)]
+    pairs = [(names[rng.randrange(people)], names[rng.randrange(people)]) for _ in range(n)]
+    # Relatives share recent ancestors; random pairs mostly don't.
+    near_pairs = []
+    for (name,) in people_sample:
+        sibs = tree.get_siblings(name) or [name]
+        cousins = [c for p in tree.get_parents(name) for gp in tree.get_parents(p) for c in tree.get_children(gp)]
+        near_pairs.append((name, rng.choice(cousins or sibs)))
+
+    record("get_ancestors", tree.get_ancestors, people_sample)
+    record("get_ancestors(max=3)", lambda x: tree.get_ancestors(x, 3), people_sample)
+    record("get_descendants", tree.get_descendants, people_sample)
+    record("get_descendants early", tree.get_descendants, early_sample)
+    record("get_descendants(max=3) early", lambda x: tree.get_descendants(x, 3), early_sample)
+    record("find_common_ancestor", tree.find_common_ancestor, pairs)
+    record("find_common_ancestor near", tree.find_common_ancestor, near_pairs)
+    record("is_ancestor", tree.is_ancestor, pairs)
+    record("relationship", tree.relationship, near_pairs)
+    record("ancestors_of_many(100)", lambda xs: tree.ancestors_of_many(xs, 5),
+           [([x for (x,) in people_sample[:100]],)])
+    # Kinship from a cold memo between far ends of the latest generation, whose
+    # pedigrees are the largest; the memo should end up with about one entry
+    # per shared ancestor, not one per pair of ancestors.
+    latest = names[-max(2, people // 50):]
+    far_pairs = [(latest[i], latest[-1 - i]) for i in range(min(n, 5, len(latest) // 2))]
+    record("kinship (cold)", lambda a, b: KinshipCoefficients(tree).kinship(a, b), far_pairs)
+    coefficients = KinshipCoefficients(tree)
+    for a, b in far_pairs:
+        coefficients.kinship(a, b)
+    results["kinship memo"] = {"entries": len(coefficients), "people": people}
+    print(f"  {'kinship memo entries':<30} {len(coefficients):>14,}")
+    if args.closure:
+        record("enable_reachability_index", tree.enable_reachability_index, [()])
+        record("is_ancestor (closure)", tree.is_ancestor, pairs)
+        record("find_common_ancestor (cl)", tree.find_common_ancestor, pairs)
+        tree.disable_reachability_index()
+
+    if not args.skip_io:
+        with tempfile.TemporaryDirectory() as tmp:
+            js, jl, snap = (os.path.join(tmp, f) for f in ("t.json", "t.jsonl", "t.snap"))
+            record("save_json", tree.save_json, [(js,)])
+            record("load_json", lambda p: FamilyTree().load_json(p), [(js,)])
+            record("save_jsonl", tree.save_jsonl, [(jl,)])
+            record("load_json (jsonl)", lambda p: FamilyTree().load_json(p), [(jl,)])
+            record("save_snapshot", tree.save_snapshot, [(snap,)])
+            record("open_snapshot + query", lambda p, x: FamilyTree.open_snapshot(p).get_ancestors(x),
+                   [(snap, people_sample[0][0])])
+            results["file sizes"] = {"json": os.path.getsize(js), "jsonl": os.path.getsize(jl),
+                                     "snapshot": os.path.getsize(snap)}
+    return results
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> int:
+    """Print time ratios against ``baseline``; return the number of regressions."""
+    regressions = 0
+    print(f"\nAgainst baseline (tolerance {tolerance:.0%}):")
+    for size, ops in current["results"].items():
+        old_ops = baseline.get("results", {}).get(size, {})
+        for label, r in ops.items():
+            old = old_ops.get(label)
+            if not old or "seconds" not in r or not old["seconds"]:
+                continue
+            ratio = r["seconds"] / old["seconds"]
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag = "  << slower"
+                regressions += 1
+            elif ratio < 1 / (1 + tolerance):
+                flag = "  faster"
+            print(f"  {size:>10} {label:<30} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10 ** 5])
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--branching", type=float, default=2.4)
+    parser.add_argument("--collapse", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=50, help="samples per query benchmark")
+    parser.add_argument("--closure", action="store_true", help="also build and query the reachability index")
+    parser.add_argument("--skip-io", action="store_true")
+    parser.add_argument("--record", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a file written by --record")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    current = {"meta": {"python": sys.version.split()[0], "platform": platform.platform(),
+                        "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "args": vars(args)},
+               "results": {str(size): run_size(size, args) for size in args.sizes}}
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        sys.exit(1 if compare(current, baseline, args.tolerance) else 0)
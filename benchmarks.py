@@ -0,0 +1,258 @@
+"""Micro-benchmarks for the FamilyTree engine in got.py.
+
+Run ``python benchmarks.py`` to print timings.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from got import FamilyTree, write_data_module
+from got_pool import TraversalPool
+from kinship import Kinship, KinshipCoefficients
+
+
+def inbred_tree(depth: int, width: int = 4, seed: int = 0) -> Tuple[FamilyTree, str]:
+    """Build ``depth`` generations of ``width`` people where every child's two
+    parents come from a small pool in the previous generation, so ancestry
+    collapses onto the same few people over and over (like the Targaryens)."""
+    rng = random.Random(seed)
+    tree = FamilyTree()
+    prev: List[str] = []
+    for g in range(depth):
+        cur = [f"G{g}-{k}" for k in range(width)]
+        for name in cur:
+            parents = rng.sample(prev, 2) if len(prev) >= 2 else prev
+            tree.add_person(name, parents=parents)
+        prev = cur
+    tree.compact()
+    return tree, prev[0]
+
+
+def naive_bfs_ancestors(tree: FamilyTree, name: str) -> Dict[str, Tuple[int, List[str]]]:
+    """The previous path-copying BFS without a visited check, kept for comparison."""
+    results: Dict[str, Tuple[int, List[str]]] = {}
+    q = deque([(name, 0, [name])])
+    while q:
+        cur, dist, path = q.popleft()
+        for par in tree.get_parents(cur):
+            new_path = path + [par]
+            gen = dist + 1
+            if par not in results or gen < results[par][0]:
+                results[par] = (gen, new_path)
+            q.append((par, gen, new_path))
+    return results
+
+
+def timed(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_ancestors(depths: List[int], width: int, naive_limit: int):
+    print(f"Ancestor BFS on inbred trees (width={width})")
+    print(f"{'depth':>7} {'ancestors':>10} {'bfs ms':>9} {'us/anc':>7} {'paths ms':>9} {'naive ms':>9}")
+    for depth in depths:
+        tree, leaf = inbred_tree(depth, width)
+        n_anc = len(tree.get_ancestors(leaf))
+        bfs = timed(tree.get_ancestors, leaf)
+        paths = timed(lambda: tree.get_ancestors_with_paths(leaf).get("G0-0"))
+        naive = f"{timed(naive_bfs_ancestors, tree, leaf, repeat=1) * 1e3:9.1f}" if depth <= naive_limit else f"{'-':>9}"
+        print(f"{depth:>7} {n_anc:>10} {bfs * 1e3:>9.2f} {bfs * 1e6 / max(n_anc, 1):>7.2f} {paths * 1e3:>9.2f} {naive}")
+
+
+def bench_ancestor_path(depth: int, width: int, hops: List[int]):
+    tree, leaf = inbred_tree(depth, width)
+    print(f"\nPoint-to-point ancestor path (depth={depth}, width={width})")
+    print(f"{'hops':>7} {'bidir ms':>9} {'full bfs ms':>12}")
+    for h in hops:
+        target = next(a for a, g in tree.get_ancestors(leaf, max_generations=h).items() if g == h)
+        bidir = timed(tree.get_ancestor_path, leaf, target)
+        full = timed(lambda: tree.get_ancestors_with_paths(leaf)[target])
+        print(f"{h:>7} {bidir * 1e3:>9.3f} {full * 1e3:>12.2f}")
+
+
+def full_common_ancestor(tree: FamilyTree, name1: str, name2: str):
+    """Intersect both complete ancestor sets, as got_app used to."""
+    a1 = tree.get_ancestors(name1)
+    a2 = tree.get_ancestors(name2)
+    common = a1.keys() & a2.keys()
+    return min(((a, a1[a], a2[a]) for a in common), key=lambda x: x[1] + x[2], default=None)
+
+
+def bench_common_ancestor(depth: int, width: int, samples: int = 200, seed: int = 0):
+    tree, _ = inbred_tree(depth, width)
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(samples):
+        g = rng.randrange(depth // 2, depth)
+        pairs.append((f"G{g}-{rng.randrange(width)}", f"G{g - rng.randrange(3)}-{rng.randrange(width)}"))
+    indexed = timed(lambda: [tree.find_common_ancestor(a, b) for a, b in pairs], repeat=1)
+    full = timed(lambda: [full_common_ancestor(tree, a, b) for a, b in pairs], repeat=1)
+    print(f"\nClosest common ancestor, {samples} near-relative pairs (depth={depth})")
+    print(f"  bounded climb: {indexed * 1e6 / samples:9.1f} us/query")
+    print(f"  full sets:     {full * 1e6 / samples:9.1f} us/query")
+
+
+def bench_reachability(depth: int, width: int, samples: int = 2000, seed: int = 0):
+    tree, _ = inbred_tree(depth, width)
+    build = timed(tree.enable_reachability_index, repeat=1)
+    rng = random.Random(seed)
+    pairs = [(f"G{rng.randrange(depth)}-{rng.randrange(width)}", f"G{rng.randrange(depth)}-{rng.randrange(width)}")
+             for _ in range(samples)]
+    indexed = timed(lambda: [tree.is_ancestor(a, b) for a, b in pairs], repeat=1)
+    tree.disable_reachability_index()
+    searched = timed(lambda: [tree.is_ancestor(a, b) for a, b in pairs], repeat=1)
+    print(f"\nis_ancestor on random pairs (depth={depth}, width={width})")
+    print(f"  closure build: {build * 1e3:9.1f} ms")
+    print(f"  closure:       {indexed * 1e6 / samples:9.2f} us/query")
+    print(f"  path search:   {searched * 1e6 / samples:9.2f} us/query")
+
+
+def bench_batch(depth: int, width: int, max_generations: Optional[int] = 10):
+    tree, _ = inbred_tree(depth, width)
+    people = list(tree)
+    batch = timed(tree.ancestors_of_many, people, max_generations, repeat=1)
+    single = timed(lambda: [tree.get_ancestors(p, max_generations) for p in people], repeat=1)
+    down_batch = timed(tree.descendants_of_many, people, max_generations, repeat=1)
+    down_single = timed(lambda: [tree.get_descendants(p, max_generations) for p in people], repeat=1)
+    print(f"\nBatch queries for all {len(people)} people (max_generations={max_generations})")
+    print(f"  ancestors_of_many:   {batch * 1e3:9.1f} ms   (one by one: {single * 1e3:9.1f} ms)")
+    print(f"  descendants_of_many: {down_batch * 1e3:9.1f} ms   (one by one: {down_single * 1e3:9.1f} ms)")
+
+
+def bench_pool(depth: int, width: int, workers: Optional[int] = None, queries: int = 32):
+    """Many concurrent deep descendant walks, as a busy got_app would see them.
+    The pool only pays off with more than one CPU."""
+    workers = workers or min(4, os.cpu_count() or 1)
+    tree, _ = inbred_tree(depth, width)
+    roots = [f"G{g}-0" for g in range(queries)]
+    with tempfile.TemporaryDirectory() as tmp:
+        snap = os.path.join(tmp, "bench.snap")
+        tree.save_snapshot(snap)
+        pool = TraversalPool(snap, workers)
+        pool.descendant_levels(roots[0])  # start the workers
+        with ThreadPoolExecutor(workers * 2) as threads:
+            local = timed(lambda: list(threads.map(lambda r: list(tree.iter_descendant_generations(r)), roots)), repeat=1)
+            pooled = timed(lambda: list(threads.map(pool.descendant_levels, roots)), repeat=1)
+        pool.shutdown()
+    print(f"\n{queries} concurrent descendant walks (depth={depth}, width={width}, cpus={os.cpu_count()})")
+    print(f"  threads only:            {local * 1e3:9.1f} ms")
+    print(f"  {workers} worker processes:     {pooled * 1e3:9.1f} ms")
+
+
+def scan_siblings(tree: FamilyTree, name: str) -> Tuple[List[str], List[str]]:
+    """Full/half siblings by rescanning every parent's children, as got_app used to."""
+    parents = set(tree.get_parents(name))
+    full, half = [], []
+    for sib in {c for p in parents for c in tree.get_children(p)} - {name}:
+        (full if set(tree.get_parents(sib)) == parents else half).append(sib)
+    return sorted(full), sorted(half)
+
+
+def bench_kinship(depth: int, width: int, samples: int = 2000, seed: int = 0):
+    tree, _ = inbred_tree(depth, width)
+    rng = random.Random(seed)
+    people = [f"G{rng.randrange(1, depth)}-{rng.randrange(width)}" for _ in range(samples)]
+    build = timed(Kinship, tree, repeat=1)
+    kin = Kinship(tree)
+    indexed = timed(lambda: [(kin.full_siblings(p), kin.half_siblings(p)) for p in people], repeat=1)
+    scanned = timed(lambda: [scan_siblings(tree, p) for p in people], repeat=1)
+    cousins = timed(lambda: [kin.cousins(p, 1) for p in people[:200]], repeat=1)
+    print(f"\nSibling groups on {len(tree)} people (width={width})")
+    print(f"  group build:        {build * 1e3:9.1f} ms")
+    print(f"  full/half, indexed: {indexed * 1e6 / samples:9.1f} us/query")
+    print(f"  full/half, scanned: {scanned * 1e6 / samples:9.1f} us/query")
+    print(f"  first cousins:      {cousins * 1e6 / 200:9.1f} us/query")
+
+
+def naive_kinship(tree: FamilyTree, a: str, b: str) -> float:
+    """The kinship recursion without memoisation: exponential in pedigree depth."""
+    if a == b:
+        parents = tree.get_parents(a)
+        return 0.5 * (1 + (naive_kinship(tree, *parents) if len(parents) == 2 else 0))
+    if (tree.get_generation(a), a) < (tree.get_generation(b), b):
+        a, b = b, a
+    parents = tree.get_parents(a)
+    return sum(naive_kinship(tree, p, b) for p in parents) / max(2, len(parents))
+
+
+def bench_coefficients(depths: List[int], width: int, naive_limit: int):
+    print(f"\nKinship coefficient of two people in the last generation (width={width})")
+    print(f"{'depth':>7} {'memo ms':>9} {'entries':>9} {'naive ms':>9}")
+    for depth in depths:
+        tree, _ = inbred_tree(depth, width)
+        a, b = f"G{depth - 1}-0", f"G{depth - 1}-1"
+        coefficients = KinshipCoefficients(tree)
+        memo = timed(lambda: KinshipCoefficients(tree).kinship(a, b), repeat=1)
+        coefficients.kinship(a, b)
+        naive = f"{timed(naive_kinship, tree, a, b, repeat=1) * 1e3:9.1f}" if depth <= naive_limit else f"{'-':>9}"
+        print(f"{depth:>7} {memo * 1e3:>9.2f} {len(coefficients):>9} {naive}")
+
+
+def write_blob_module(tree: FamilyTree, filepath: str):
+    """The previous data-module layout: one repr'd JSON string parsed by load_data()."""
+    data_blob = json.dumps(tree.export_json(), indent=2, ensure_ascii=False)
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write("DATA_JSON = " + repr(data_blob) + "\n\n"
+                "def load_data():\n"
+                "    import json\n"
+                "    return json.loads(DATA_JSON)\n")
+
+
+def _time_import(module: str, cwd: str, call: str) -> float:
+    code = ("import time; t0 = time.perf_counter(); "
+            f"import {module}; {module}.{call}; {module}.{call}; "
+            "print(time.perf_counter() - t0)")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([cwd, os.path.dirname(os.path.abspath(__file__))]))
+    # The warm run is only meaningful if the cold run left a .pyc behind.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    out = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout)
+
+
+def bench_data_module(depth: int, width: int):
+    tree, _ = inbred_tree(depth, width)
+    print(f"\nData module import + 2x load (people={len(tree)})")
+    print(f"{'module':>24} {'ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        write_blob_module(tree, os.path.join(tmp, "blob_data.py"))
+        write_data_module(tree.iter_records(), os.path.join(tmp, "tuple_data.py"))
+        # The first import of each module compiles it and writes the .pyc.
+        for label, module, call in (("blob (compile)", "blob_data", "load_data()"),
+                                    ("blob", "blob_data", "load_data()"),
+                                    ("tuples (compile)", "tuple_data", "load_data()"),
+                                    ("tuples load_data", "tuple_data", "load_data()"),
+                                    ("tuples load_tree", "tuple_data", "load_tree()")):
+            print(f"{label:>24} {_time_import(module, tmp, call) * 1e3:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depths", type=int, nargs="+", default=[8, 12, 16, 1000, 10000, 100000])
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--naive-limit", type=int, default=16,
+                        help="skip the exponential reference BFS above this depth")
+    args = parser.parse_args()
+    bench_ancestors(args.depths, args.width, args.naive_limit)
+    bench_ancestor_path(max(args.depths), args.width, [2, 10, 100])
+    bench_common_ancestor(min(max(args.depths), 5000), args.width)
+    bench_reachability(min(max(args.depths), 1000), args.width)
+    bench_batch(min(max(args.depths), 500), 40)
+    bench_data_module(min(max(args.depths), 25000), args.width)
+    bench_pool(min(max(args.depths), 20000), args.width)
+    bench_kinship(min(max(args.depths), 2000), 50)
+    bench_coefficients([d for d in args.depths if d <= 1000], args.width, min(args.naive_limit, 12))
@@ -1,4 +1,7 @@
-def classify_number_interactive():
+from decision_tree import NUMBER_TREE
+
+
+def classify_number_interactive(tree=NUMBER_TREE):
     """
     Interactive number guessing game that asks questions to classify a number (1-9)
     """
@@ -8,86 +11,25 @@ def classify_number_interactive():
     print("=" * 50)
     print()
     
-    # Question 1: Is it 5?
-    response = input("Is your number 5? (yes/no): ").strip().lower()
-    if response in ['yes', 'y']:
-        print("\n🎉 Your number is: 5")
-        return 5
-    
-    # Question 2: Is it even?
-    response = input("Is your number even? (yes/no): ").strip().lower()
-    is_even = response in ['yes', 'y']
+    # Walk the shared decision tree from the root until a leaf names the number
+    node = 0
+    while not tree.is_leaf(node):
+        response = input(f"{tree.question(node)} (yes/no): ").strip().lower()
+        node = tree.child(node, response in ['yes', 'y'])
     
-    if is_even:
-        # Even numbers: 2, 4, 6, 8
-        response = input("Is your number a prime number? (yes/no): ").strip().lower()
-        is_prime = response in ['yes', 'y']
-        
-        if is_prime:
-            # Only even prime is 2
-            print("\n🎉 Your number is: 2")
-            return 2
-        else:
-            # Not prime: 4, 6, 8
-            response = input("Is your number divisible by 3? (yes/no): ").strip().lower()
-            div_by_3 = response in ['yes', 'y']
-            
-            if div_by_3:
-                print("\n🎉 Your number is: 6")
-                return 6
-            else:
-                # 4 or 8
-                response = input("Is your number a perfect square? (yes/no): ").strip().lower()
-                is_perfect_square = response in ['yes', 'y']
-                
-                if is_perfect_square:
-                    print("\n🎉 Your number is: 4")
-                    return 4
-                else:
-                    print("\n🎉 Your number is: 8")
-                    return 8
-    else:
-        # Odd numbers: 1, 3, 7, 9
-        response = input("Is your number a prime number? (yes/no): ").strip().lower()
-        is_prime = response in ['yes', 'y']
-        
-        if is_prime:
-            # Odd primes: 3, 7
-            response = input("Is your number divisible by 3? (yes/no): ").strip().lower()
-            div_by_3 = response in ['yes', 'y']
-            
-            if div_by_3:
-                print("\n🎉 Your number is: 3")
-                return 3
-            else:
-                print("\n🎉 Your number is: 7")
-                return 7
-        else:
-            # Not prime odd: 1, 9
-            response = input("Is your number a perfect square? (yes/no): ").strip().lower()
-            is_perfect_square = response in ['yes', 'y']
-            
-            if is_perfect_square:
-                print("\n🎉 Your number is: 9")
-                return 9
-            else:
-                print("\n🎉 Your number is: 1")
-                return 1
+    result = tree.result[node]
+    print(f"\n🎉 Your number is: {result}")
+    return result
 
 
-def classify_number_direct(num):
+def classify_number_direct(num, tree=NUMBER_TREE):
     """
-    Direct classification for numbers 1-9
+    Direct classification for numbers 1-9, answering the tree's questions for the number
     """
     if num < 1 or num > 9:
         return "Number must be between 1 and 9"
     
-    # Direct mapping
-    classifications = {
-        1: 1, 2: 2, 3: 3, 4: 4, 5: 5,
-        6: 6, 7: 7, 8: 8, 9: 9
-    }
-    return classifications[num]
+    return tree.classify(num)
 
 
 def show_menu():
@@ -115,14 +57,17 @@ def show_all_classifications():
     print("ALL NUMBER CLASSIFICATIONS (1-9)")
     print("=" * 50)
     
-    for num in range(1, 10):
+    numbers = list(range(1, 10))
+    classified = NUMBER_TREE.classify_many(numbers)
+    
+    for num, result in zip(numbers, classified):
         is_prime = num in [2, 3, 5, 7]
         is_even = num % 2 == 0
         is_perfect_square = num in [1, 4, 9]
         div_by_2 = num % 2 == 0
         div_by_3 = num % 3 == 0
         
-        print(f"\nNumber: {num} → Classified as: {num}")
+        print(f"\nNumber: {num} → Classified as: {result}")
         print(f"  Prime: {is_prime} | Even: {is_even} | Perfect Square: {is_perfect_square}")
         print(f"  Divisible by 2: {div_by_2} | Divisible by 3: {div_by_3}")
 
@@ -0,0 +1,382 @@
+"""Yes/no decision trees for the number guessing game, compiled to flat node tables.
+
+A tree is written once as nested ``(predicate, yes, no)`` tuples with numbers
+at the leaves, and compiled into parallel arrays indexed by node id, so the
+game moves between states with one array lookup per answer and whole ranges
+of numbers can be classified at once.
+"""
+
+from array import array
+from collections import deque
+from itertools import compress
+from math import isqrt
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class Predicate(NamedTuple):
+    key: str
+    question: str
+    label: str
+    test: Callable[[int], bool]
+    # members(lo, hi): a bytearray with 1 at offset n - lo for each n in lo..hi passing the test
+    members: Optional[Callable[[int, int], bytearray]] = None
+
+
+def _is_prime(n: int) -> bool:
+    if n < 4:
+        return n >= 2
+    if n % 2 == 0 or n % 3 == 0:
+        return False
+    i = 5
+    while i * i <= n:
+        if n % i == 0 or n % (i + 2) == 0:
+            return False
+        i += 6
+    return True
+
+
+def _primes(lo: int, hi: int) -> bytearray:
+    out = bytearray(hi - lo + 1)
+    if hi < 2:
+        return out
+    sieve = bytearray([1]) * (hi + 1)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, isqrt(hi) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytearray(len(range(p * p, hi + 1, p)))
+    start = max(lo, 0)
+    out[start - lo:] = sieve[start:]
+    return out
+
+
+def _squares(lo: int, hi: int) -> bytearray:
+    out = bytearray(hi - lo + 1)
+    r = isqrt(lo - 1) + 1 if lo > 0 else 0
+    while r * r <= hi:
+        out[r * r - lo] = 1
+        r += 1
+    return out
+
+
+def _multiples(k: int) -> Callable[[int, int], bytearray]:
+    def members(lo: int, hi: int) -> bytearray:
+        out = bytearray(hi - lo + 1)
+        first = -lo % k
+        out[first::k] = bytearray([1]) * len(range(first, len(out), k))
+        return out
+    return members
+
+
+def equals(k: int) -> Predicate:
+    def members(lo: int, hi: int) -> bytearray:
+        out = bytearray(hi - lo + 1)
+        if lo <= k <= hi:
+            out[k - lo] = 1
+        return out
+    return Predicate(f"eq{k}", f"Is your number {k}?", f"Is it {k}?", lambda n: n == k, members)
+
+
+def divisible_by(k: int) -> Predicate:
+    return Predicate(f"div{k}", f"Is your number divisible by {k}?", f"Div by {k}?", lambda n: n % k == 0,
+                     _multiples(k))
+
+
+def greater_than(t: int) -> Predicate:
+    def members(lo: int, hi: int) -> bytearray:
+        out = bytearray(hi - lo + 1)
+        start = min(max(t + 1 - lo, 0), len(out))
+        out[start:] = bytearray([1]) * (len(out) - start)
+        return out
+    return Predicate(f"gt{t}", f"Is your number greater than {t}?", f"> {t}?", lambda n: n > t, members)
+
+
+EVEN = Predicate("even", "Is your number even?", "Is it even?", lambda n: n % 2 == 0, _multiples(2))
+PRIME = Predicate("prime", "Is your number a prime number?", "Prime?", _is_prime, _primes)
+PERFECT_SQUARE = Predicate("square", "Is your number a perfect square?", "Perfect\nSquare?",
+                           lambda n: n >= 0 and isqrt(n) ** 2 == n, _squares)
+
+# The library build_tree() draws on, in order of preference when splits tie.
+DEFAULT_PREDICATES = (EVEN, PRIME, PERFECT_SQUARE) + tuple(divisible_by(k) for k in range(3, 11))
+
+Spec = Union[int, Tuple[Predicate, "Spec", "Spec"]]
+
+LEAF = -1
+THRESHOLD = -2  # "greater than arg[i]?", kept as a number so big trees don't need a Predicate per node
+
+
+class DecisionTree:
+    """A compiled yes/no tree. Node 0 is the root.
+
+    ``kind[i]`` says what node ``i`` asks: an index into ``predicates``,
+    ``THRESHOLD`` for "greater than ``arg[i]``?", or ``LEAF``. ``yes[i]`` /
+    ``no[i]`` are the nodes each answer leads to and ``result[i]`` the number
+    a leaf identifies. Node ids grow with depth.
+    """
+
+    def __init__(self, spec: Optional[Spec] = None):
+        self.predicates: List[Predicate] = []
+        self._kind_of: Dict[str, int] = {}
+        self.kind = array("i")
+        self.arg = array("q")
+        self.yes = array("i")
+        self.no = array("i")
+        self.result = array("q")
+        self.depth = array("i")
+        if spec is None:
+            return
+        # Compile breadth-first so node ids grow with depth.
+        pending: List[Tuple[Spec, int]] = [(spec, 0)]
+        for node, depth in pending:
+            i = self._add(depth)
+            if isinstance(node, tuple):
+                predicate, yes, no = node
+                self.kind[i] = self._kind(predicate)
+                self.yes[i] = len(pending)
+                self.no[i] = len(pending) + 1
+                pending.append((yes, depth + 1))
+                pending.append((no, depth + 1))
+            else:
+                self.result[i] = node
+
+    def _add(self, depth: int) -> int:
+        self.kind.append(LEAF)
+        self.arg.append(0)
+        self.yes.append(LEAF)
+        self.no.append(LEAF)
+        self.result.append(0)
+        self.depth.append(depth)
+        return len(self.kind) - 1
+
+    def _kind(self, predicate: Predicate) -> int:
+        k = self._kind_of.get(predicate.key)
+        if k is None:
+            k = self._kind_of[predicate.key] = len(self.predicates)
+            self.predicates.append(predicate)
+        return k
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    @property
+    def numbers(self) -> List[int]:
+        """Every number some leaf identifies."""
+        return sorted(self.result[i] for i in range(len(self)) if self.is_leaf(i))
+
+    def is_leaf(self, node: int) -> bool:
+        return self.kind[node] == LEAF
+
+    def predicate(self, node: int) -> Optional[Predicate]:
+        k = self.kind[node]
+        if k == LEAF:
+            return None
+        return greater_than(self.arg[node]) if k == THRESHOLD else self.predicates[k]
+
+    def question(self, node: int) -> Optional[str]:
+        predicate = self.predicate(node)
+        return None if predicate is None else predicate.question
+
+    def _test(self, node: int) -> Callable[[int], bool]:
+        k = self.kind[node]
+        return self.arg[node].__lt__ if k == THRESHOLD else self.predicates[k].test
+
+    def child(self, node: int, answer: bool) -> int:
+        return self.yes[node] if answer else self.no[node]
+
+    def path(self, answers: Iterable[bool]) -> List[int]:
+        """Nodes visited from the root following ``answers``; stops at a leaf."""
+        node = 0
+        nodes = [node]
+        for answer in answers:
+            if self.is_leaf(node):
+                break
+            node = self.child(node, answer)
+            nodes.append(node)
+        return nodes
+
+    def answers_for(self, n: int) -> List[bool]:
+        """The answers someone thinking of ``n`` gives, root to leaf."""
+        node, answers = 0, []
+        while not self.is_leaf(node):
+            answers.append(bool(self._test(node)(n)))
+            node = self.child(node, answers[-1])
+        return answers
+
+    def classify(self, n: int) -> int:
+        node = 0
+        while not self.is_leaf(node):
+            node = self.child(node, self._test(node)(n))
+        return self.result[node]
+
+    def classify_many(self, numbers: Sequence[int]) -> List[int]:
+        """``classify`` for every number, partitioning the batch node by node rather than walking it one by one."""
+        out = [0] * len(numbers)
+        pending = [(0, list(range(len(numbers))))]
+        while pending:
+            node, idx = pending.pop()
+            if not idx:
+                continue
+            if self.is_leaf(node):
+                r = self.result[node]
+                for i in idx:
+                    out[i] = r
+                continue
+            test = self._test(node)
+            yes, no = [], []
+            for i in idx:
+                (yes if test(numbers[i]) else no).append(i)
+            pending.append((self.yes[node], yes))
+            pending.append((self.no[node], no))
+        return out
+
+    def expected_questions(self) -> float:
+        """Mean number of questions over the numbers the tree identifies, each equally likely."""
+        leaves = [i for i in range(len(self)) if self.is_leaf(i)]
+        return sum(self.depth[i] for i in leaves) / len(leaves) if leaves else 0.0
+
+    def layout(self) -> Dict[int, Tuple[float, float]]:
+        """``(x, depth)`` per node: leaves one unit apart left to right, parents centred over their children."""
+        pos: Dict[int, Tuple[float, float]] = {}
+        next_x = 0.0
+        stack = [(0, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if self.is_leaf(node):
+                pos[node] = (next_x, self.depth[node])
+                next_x += 1
+            elif expanded:
+                x = (pos[self.yes[node]][0] + pos[self.no[node]][0]) / 2
+                pos[node] = (x, self.depth[node])
+            else:
+                stack.extend([(node, True), (self.no[node], False), (self.yes[node], False)])
+        return pos
+
+
+def _optimal_splits(n: int) -> Tuple[int, int]:
+    # A tree with n equally likely leaves has minimal expected depth exactly when all
+    # leaves sit on levels k and k + 1 (2^k <= n < 2^(k+1)), so each side of the root
+    # split must fit its leaves on levels k - 1 and k below it.
+    half = 1 << (n.bit_length() - 2) if n > 1 else 0
+    return max(half, n - 2 * half), min(2 * half, n - half)
+
+
+def build_tree(lo: int, hi: int, predicates: Sequence[Predicate] = DEFAULT_PREDICATES) -> DecisionTree:
+    """A tree identifying every number in ``lo..hi`` in the fewest questions on average.
+
+    Each node asks the library predicate whose split is the most balanced
+    (highest entropy) among those that keep the expected depth minimal
+    (``_optimal_splits``), earlier predicates winning ties, and falls back to
+    "greater than" the median, which always qualifies. Sets are counted and
+    split through one membership bytearray per predicate, and a predicate
+    that is constant on a node's numbers is dropped for the whole subtree.
+    """
+    if hi < lo:
+        raise ValueError(f"empty range {lo}..{hi}")
+    tree = DecisionTree()
+    size = hi - lo + 1
+    # A full binary tree with one leaf per number has exactly 2 * size - 1 nodes.
+    total = 2 * size - 1
+    tree.kind = array("i", [LEAF]) * total
+    tree.arg = array("q", [0]) * total
+    tree.yes = array("i", [LEAF]) * total
+    tree.no = array("i", [LEAF]) * total
+    tree.result = array("q", [0]) * total
+    tree.depth = array("i", [0]) * total
+    members = [p.members(lo, hi) if p.members else bytearray(map(p.test, range(lo, hi + 1))) for p in predicates]
+    flipped = bytes([1, 0]) + bytes(254)
+    absent = [m.translate(flipped) for m in members]
+    kinds = [tree._kind(p) for p in predicates]
+    next_id = 1
+    if size == 1:
+        tree.result[0] = lo
+    pending = deque([(0, array("i", range(size)), list(range(len(predicates))))] if size > 1 else [])
+    while pending:
+        node, numbers, live = pending.popleft()
+        n = len(numbers)
+        if n == 2:
+            # Half of all questions separate a last pair: two lookups per predicate, no arrays.
+            x, y = numbers
+            for j in live:
+                m = members[j]
+                if m[x] != m[y]:
+                    tree.kind[node] = kinds[j]
+                    if m[x]:
+                        x, y = y, x
+                    break
+            else:
+                tree.kind[node] = THRESHOLD
+                tree.arg[node] = lo + x
+            depth = tree.depth[node] + 1
+            tree.yes[node], tree.no[node] = next_id, next_id + 1
+            tree.result[next_id], tree.result[next_id + 1] = lo + y, lo + x
+            tree.depth[next_id] = tree.depth[next_id + 1] = depth
+            next_id += 2
+            continue
+        low, high = _optimal_splits(n)
+        best, best_balance = -1, 0
+        kept = []
+        for pos, j in enumerate(live):
+            a = sum(map(members[j].__getitem__, numbers))
+            if a == 0 or a == n:
+                continue
+            kept.append(j)
+            if low <= a <= high and min(a, n - a) > best_balance:
+                best, best_balance = j, min(a, n - a)
+                if best_balance == n // 2:
+                    kept.extend(live[pos + 1:])
+                    break
+        if best >= 0:
+            yes = array("i", compress(numbers, map(members[best].__getitem__, numbers)))
+            no = array("i", compress(numbers, map(absent[best].__getitem__, numbers)))
+            tree.kind[node] = kinds[best]
+            kept.remove(best)
+        else:
+            split = n - n // 2
+            yes, no = numbers[split:], numbers[:split]
+            tree.kind[node] = THRESHOLD
+            tree.arg[node] = lo + numbers[split - 1]
+        depth = tree.depth[node] + 1
+        for side, child_numbers in ((tree.yes, yes), (tree.no, no)):
+            side[node] = next_id
+            tree.depth[next_id] = depth
+            if len(child_numbers) == 1:
+                tree.result[next_id] = lo + child_numbers[0]
+            else:
+                pending.append((next_id, child_numbers, kept))
+            next_id += 1
+    return tree
+
+
+# The 1-9 game: every number is pinned down in at most five questions.
+NUMBER_TREE = DecisionTree(
+    (equals(5), 5,
+     (EVEN,
+      (PRIME, 2,
+       (divisible_by(3), 6,
+        (PERFECT_SQUARE, 4, 8))),
+      (PRIME,
+       (divisible_by(3), 3, 7),
+       (greater_than(5), 9, 1)))))
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build the question tree for a range and report its size, "
+                                                 "or play the guessing game on it.")
+    parser.add_argument("hi", type=int)
+    parser.add_argument("--lo", type=int, default=1)
+    parser.add_argument("--play", action="store_true", help="ask the questions for a number you think of")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    tree = build_tree(args.lo, args.hi)
+    elapsed = time.perf_counter() - started
+    print(f"{args.lo}..{args.hi}: {len(tree)} nodes in {elapsed:.2f}s, "
+          f"{tree.expected_questions():.3f} questions on average, at most {max(tree.depth)}")
+    if args.play:
+        node = 0
+        while not tree.is_leaf(node):
+            response = input(f"{tree.question(node)} (yes/no): ").strip().lower()
+            node = tree.child(node, response in ['yes', 'y'])
+        print(f"\n🎉 Your number is: {tree.result[node]}")
@@ -1,10 +1,211 @@
 # Auto-generated minimal Game of Thrones Family Tree data module
 
-DATA_JSON = '{\n  "Brandon the Builder": {\n    "parents": [],\n    "children": [\n      "Edwyle Stark"\n    ],\n    "meta": {}\n  },\n  "Edwyle Stark": {\n    "parents": [\n      "Brandon the Builder"\n    ],\n    "children": [\n      "Rickard Stark"\n    ],\n    "meta": {}\n  },\n  "Rickard Stark": {\n    "parents": [\n      "Edwyle Stark"\n    ],\n    "children": [\n      "Brandon Stark",\n      "Benjen Stark",\n      "Eddard Stark",\n      "Lyanna Stark"\n    ],\n    "meta": {}\n  },\n  "Lyarra Stark": {\n    "parents": [],\n    "children": [\n      "Brandon Stark",\n      "Benjen Stark",\n      "Eddard Stark",\n      "Lyanna Stark"\n    ],\n    "meta": {}\n  },\n  "Brandon Stark": {\n    "parents": [\n      "Rickard Stark",\n      "Lyarra Stark"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Eddard Stark": {\n    "parents": [\n      "Rickard Stark",\n      "Lyarra Stark"\n    ],\n    "children": [\n      "Arya Stark",\n      "Rickon Stark",\n      "Robb Stark",\n      "Sansa Stark",\n      "Bran Stark"\n    ],\n    "meta": {}\n  },\n  "Lyanna Stark": {\n    "parents": [\n      "Rickard Stark",\n      "Lyarra Stark"\n    ],\n    "children": [\n      "Jon Snow"\n    ],\n    "meta": {}\n  },\n  "Benjen Stark": {\n    "parents": [\n      "Rickard Stark",\n      "Lyarra Stark"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Catelyn Tully": {\n    "parents": [\n      "Hoster Tully",\n      "Minisa Whent"\n    ],\n    "children": [\n      "Arya Stark",\n      "Rickon Stark",\n      "Robb Stark",\n      "Sansa Stark",\n      "Bran Stark"\n    ],\n    "meta": {}\n  },\n  "Robb Stark": {\n    "parents": [\n      "Eddard Stark",\n      "Catelyn Tully"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Sansa Stark": {\n    "parents": [\n      "Eddard Stark",\n      "Catelyn Tully"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Arya Stark": {\n    "parents": [\n      "Eddard Stark",\n      "Catelyn Tully"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Bran Stark": {\n    "parents": [\n      "Eddard Stark",\n      "Catelyn Tully"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Rickon Stark": {\n    "parents": [\n      "Eddard Stark",\n      "Catelyn Tully"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Jon Snow": {\n    "parents": [\n      "Rhaegar Targaryen",\n      "Lyanna Stark"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Rhaegar Targaryen": {\n    "parents": [\n      "Aerys II Targaryen",\n      "Rhaella Targaryen"\n    ],\n    "children": [\n      "Aegon (young) Targaryen",\n      "Rhaenys Targaryen",\n      "Jon Snow"\n    ],\n    "meta": {}\n  },\n  "Aegon I Targaryen": {\n    "parents": [],\n    "children": [\n      "Jaehaerys I Targaryen"\n    ],\n    "meta": {}\n  },\n  "Jaehaerys I Targaryen": {\n    "parents": [\n      "Aegon I Targaryen"\n    ],\n    "children": [\n      "Aegon V Targaryen"\n    ],\n    "meta": {}\n  },\n  "Aegon V Targaryen": {\n    "parents": [\n      "Jaehaerys I Targaryen"\n    ],\n    "children": [\n      "Jaehaerys II Targaryen"\n    ],\n    "meta": {}\n  },\n  "Jaehaerys II Targaryen": {\n    "parents": [\n      "Aegon V Targaryen"\n    ],\n    "children": [\n      "Aerys II Targaryen",\n      "Rhaella Targaryen"\n    ],\n    "meta": {}\n  },\n  "Aerys II Targaryen": {\n    "parents": [\n      "Jaehaerys II Targaryen"\n    ],\n    "children": [\n      "Viserys Targaryen",\n      "Rhaegar Targaryen",\n      "Daenerys Targaryen"\n    ],\n    "meta": {}\n  },\n  "Rhaella Targaryen": {\n    "parents": [\n      "Jaehaerys II Targaryen"\n    ],\n    "children": [\n      "Viserys Targaryen",\n      "Rhaegar Targaryen",\n      "Daenerys Targaryen"\n    ],\n    "meta": {}\n  },\n  "Elia Martell": {\n    "parents": [\n      "Doran Martell"\n    ],\n    "children": [\n      "Aegon (young) Targaryen",\n      "Rhaenys Targaryen"\n    ],\n    "meta": {}\n  },\n  "Rhaenys Targaryen": {\n    "parents": [\n      "Rhaegar Targaryen",\n      "Elia Martell"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Aegon (young) Targaryen": {\n    "parents": [\n      "Rhaegar Targaryen",\n      "Elia Martell"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Viserys Targaryen": {\n    "parents": [\n      "Aerys II Targaryen",\n      "Rhaella Targaryen"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Daenerys Targaryen": {\n    "parents": [\n      "Aerys II Targaryen",\n      "Rhaella Targaryen"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Tytos Lannister": {\n    "parents": [],\n    "children": [\n      "Tywin Lannister"\n    ],\n    "meta": {}\n  },\n  "Joanna Lannister": {\n    "parents": [],\n    "children": [\n      "Tyrion Lannister",\n      "Jaime Lannister",\n      "Cersei Lannister"\n    ],\n    "meta": {}\n  },\n  "Tywin Lannister": {\n    "parents": [\n      "Tytos Lannister"\n    ],\n    "children": [\n      "Tyrion Lannister",\n      "Jaime Lannister",\n      "Cersei Lannister"\n    ],\n    "meta": {}\n  },\n  "Jaime Lannister": {\n    "parents": [\n      "Tywin Lannister",\n      "Joanna Lannister"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Cersei Lannister": {\n    "parents": [\n      "Tywin Lannister",\n      "Joanna Lannister"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Tyrion Lannister": {\n    "parents": [\n      "Tywin Lannister",\n      "Joanna Lannister"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Orys Baratheon": {\n    "parents": [],\n    "children": [],\n    "meta": {}\n  },\n  "Steffon Baratheon": {\n    "parents": [],\n    "children": [\n      "Robert Baratheon",\n      "Stannis Baratheon",\n      "Renly Baratheon"\n    ],\n    "meta": {}\n  },\n  "Robert Baratheon": {\n    "parents": [\n      "Steffon Baratheon"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Stannis Baratheon": {\n    "parents": [\n      "Steffon Baratheon"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Renly Baratheon": {\n    "parents": [\n      "Steffon Baratheon"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Hoster Tully": {\n    "parents": [],\n    "children": [\n      "Lysa Tully",\n      "Edmure Tully",\n      "Catelyn Tully"\n    ],\n    "meta": {}\n  },\n  "Minisa Whent": {\n    "parents": [],\n    "children": [\n      "Lysa Tully",\n      "Edmure Tully",\n      "Catelyn Tully"\n    ],\n    "meta": {}\n  },\n  "Lysa Tully": {\n    "parents": [\n      "Hoster Tully",\n      "Minisa Whent"\n    ],\n    "children": [\n      "Robert Arryn",\n      "Robin Arryn"\n    ],\n    "meta": {}\n  },\n  "Edmure Tully": {\n    "parents": [\n      "Hoster Tully",\n      "Minisa Whent"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Robin Arryn": {\n    "parents": [\n      "Lysa Tully"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Doran Martell": {\n    "parents": [],\n    "children": [\n      "Oberyn Martell",\n      "Elia Martell"\n    ],\n    "meta": {}\n  },\n  "Oberyn Martell": {\n    "parents": [\n      "Doran Martell"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Mace Tyrell": {\n    "parents": [],\n    "children": [\n      "Margaery Tyrell",\n      "Loras Tyrell"\n    ],\n    "meta": {}\n  },\n  "Olenna Tyrell": {\n    "parents": [],\n    "children": [\n      "Margaery Tyrell",\n      "Loras Tyrell"\n    ],\n    "meta": {}\n  },\n  "Margaery Tyrell": {\n    "parents": [\n      "Mace Tyrell",\n      "Olenna Tyrell"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Loras Tyrell": {\n    "parents": [\n      "Mace Tyrell",\n      "Olenna Tyrell"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Balon Greyjoy": {\n    "parents": [],\n    "children": [\n      "Asha Greyjoy",\n      "Theon Greyjoy"\n    ],\n    "meta": {}\n  },\n  "Theon Greyjoy": {\n    "parents": [\n      "Balon Greyjoy"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Asha Greyjoy": {\n    "parents": [\n      "Balon Greyjoy"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Jon Arryn": {\n    "parents": [],\n    "children": [\n      "Robert Arryn"\n    ],\n    "meta": {}\n  },\n  "Robert Arryn": {\n    "parents": [\n      "Lysa Tully",\n      "Jon Arryn"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Walder Frey": {\n    "parents": [],\n    "children": [\n      "Roslin Frey",\n      "Stevron Frey"\n    ],\n    "meta": {}\n  },\n  "Stevron Frey": {\n    "parents": [\n      "Walder Frey"\n    ],\n    "children": [],\n    "meta": {}\n  },\n  "Roslin Frey": {\n    "parents": [\n      "Walder Frey"\n    ],\n    "children": [],\n    "meta": {}\n  }\n}'
+from functools import lru_cache
 
+NAMES = (
+    'Brandon the Builder',
+    'Edwyle Stark',
+    'Rickard Stark',
+    'Lyarra Stark',
+    'Brandon Stark',
+    'Eddard Stark',
+    'Lyanna Stark',
+    'Benjen Stark',
+    'Catelyn Tully',
+    'Robb Stark',
+    'Sansa Stark',
+    'Arya Stark',
+    'Bran Stark',
+    'Rickon Stark',
+    'Jon Snow',
+    'Rhaegar Targaryen',
+    'Aegon I Targaryen',
+    'Jaehaerys I Targaryen',
+    'Aegon V Targaryen',
+    'Jaehaerys II Targaryen',
+    'Aerys II Targaryen',
+    'Rhaella Targaryen',
+    'Elia Martell',
+    'Rhaenys Targaryen',
+    'Aegon (young) Targaryen',
+    'Viserys Targaryen',
+    'Daenerys Targaryen',
+    'Tytos Lannister',
+    'Joanna Lannister',
+    'Tywin Lannister',
+    'Jaime Lannister',
+    'Cersei Lannister',
+    'Tyrion Lannister',
+    'Orys Baratheon',
+    'Steffon Baratheon',
+    'Robert Baratheon',
+    'Stannis Baratheon',
+    'Renly Baratheon',
+    'Hoster Tully',
+    'Minisa Whent',
+    'Lysa Tully',
+    'Edmure Tully',
+    'Robin Arryn',
+    'Doran Martell',
+    'Oberyn Martell',
+    'Mace Tyrell',
+    'Olenna Tyrell',
+    'Margaery Tyrell',
+    'Loras Tyrell',
+    'Balon Greyjoy',
+    'Theon Greyjoy',
+    'Asha Greyjoy',
+    'Jon Arryn',
+    'Robert Arryn',
+    'Walder Frey',
+    'Stevron Frey',
+    'Roslin Frey',
+)
+
+# PARENTS[i] / CHILDREN[i] hold indices into NAMES.
+PARENTS = (
+    (),
+    (0,),
+    (1,),
+    (),
+    (2, 3),
+    (2, 3),
+    (2, 3),
+    (2, 3),
+    (38, 39),
+    (5, 8),
+    (5, 8),
+    (5, 8),
+    (5, 8),
+    (5, 8),
+    (15, 6),
+    (20, 21),
+    (),
+    (16,),
+    (17,),
+    (18,),
+    (19,),
+    (19,),
+    (43,),
+    (15, 22),
+    (15, 22),
+    (20, 21),
+    (20, 21),
+    (),
+    (),
+    (27,),
+    (29, 28),
+    (29, 28),
+    (29, 28),
+    (),
+    (),
+    (34,),
+    (34,),
+    (34,),
+    (),
+    (),
+    (38, 39),
+    (38, 39),
+    (40,),
+    (),
+    (43,),
+    (),
+    (),
+    (45, 46),
+    (45, 46),
+    (),
+    (49,),
+    (49,),
+    (),
+    (40, 52),
+    (),
+    (54,),
+    (54,),
+)
+
+CHILDREN = (
+    (1,),
+    (2,),
+    (4, 7, 5, 6),
+    (4, 7, 5, 6),
+    (),
+    (11, 13, 9, 10, 12),
+    (14,),
+    (),
+    (11, 13, 9, 10, 12),
+    (),
+    (),
+    (),
+    (),
+    (),
+    (),
+    (24, 23, 14),
+    (17,),
+    (18,),
+    (19,),
+    (20, 21),
+    (25, 15, 26),
+    (25, 15, 26),
+    (24, 23),
+    (),
+    (),
+    (),
+    (),
+    (29,),
+    (32, 30, 31),
+    (32, 30, 31),
+    (),
+    (),
+    (),
+    (),
+    (35, 36, 37),
+    (),
+    (),
+    (),
+    (40, 41, 8),
+    (40, 41, 8),
+    (53, 42),
+    (),
+    (),
+    (44, 22),
+    (),
+    (47, 48),
+    (47, 48),
+    (),
+    (),
+    (51, 50),
+    (),
+    (),
+    (53,),
+    (),
+    (56, 55),
+    (),
+    (),
+)
+
+# Sparse: only people with metadata appear here.
+META = {
+}
+
+
+@lru_cache(maxsize=None)
 def load_data():
-    import json
-    return json.loads(DATA_JSON)
+    """Return ``{name: {"parents", "children", "meta"}}`` (built once; do not mutate)."""
+    return {
+        name: {
+            "parents": [NAMES[p] for p in PARENTS[i]],
+            "children": [NAMES[c] for c in CHILDREN[i]],
+            "meta": META.get(i, {}),
+        }
+        for i, name in enumerate(NAMES)
+    }
+
+
+def load_tree():
+    """Return a new got.FamilyTree built straight from the index tuples (cheap; safe to mutate)."""
+    from got import FamilyTree
+    return FamilyTree.from_adjacency(NAMES, PARENTS, META)
+
 
 if __name__ == '__main__':
     print('This module contains GAME OF THRONES family data (partial).\n')
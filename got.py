@@ -1,245 +1,1386 @@
 # Retry: fixed the module_code construction bug and re-run the population + export + demo.
 
+import codecs
+import heapq
 import json
-from collections import deque, defaultdict
-from dataclasses import dataclass, field
-from typing import Dict, List, Set, Tuple, Optional
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+# Node ids are stored in C int arrays; 2**31 people is plenty for any genealogy.
+_ID_TYPE = "i"
+# Pending edges are folded into the packed arrays once they exceed this many
+# (or a quarter of the packed edge count, whichever is larger).
+_COMPACT_MIN_EDGES = 1024
+
+
+# Closure sets are stored as sorted, disjoint half-open id intervals
+# [s0, e0, s1, e1, ...]; a generation loaded in order collapses into a few runs.
+_NO_RUNS = array(_ID_TYPE)
+
+
+def _runs_contains(runs: Sequence[int], i: int) -> bool:
+    return bisect_right(runs, i) & 1 == 1
+
+
+def _runs_insert(runs: array, lo: int, hi: int):
+    # In place: boundaries falling inside [lo, hi] are dropped, and lo/hi are
+    # kept only where they do not land inside (or touch) an existing run.
+    i = bisect_left(runs, lo)
+    j = bisect_right(runs, hi)
+    new = array(_ID_TYPE)
+    if not i & 1:
+        new.append(lo)
+    if not j & 1:
+        new.append(hi)
+    runs[i:j] = new
+
+
+def _runs_union(a: Sequence[int], b: Sequence[int]) -> array:
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) <= 16:
+        out = array(_ID_TYPE, a)
+        for k in range(0, len(b), 2):
+            _runs_insert(out, b[k], b[k + 1])
+        return out
+    out = array(_ID_TYPE)
+    i = j = 0
+    na, nb = len(a), len(b)
+    while i < na or j < nb:
+        if j >= nb or (i < na and a[i] <= b[j]):
+            lo, hi = a[i], a[i + 1]
+            i += 2
+        else:
+            lo, hi = b[j], b[j + 1]
+            j += 2
+        if out and lo <= out[-1]:
+            if hi > out[-1]:
+                out[-1] = hi
+        else:
+            out.append(lo)
+            out.append(hi)
+    return out
+
+
+def _runs_overlap(a: Sequence[int], b: Sequence[int]) -> bool:
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i + 1] <= b[j]:
+            i += 2
+        elif b[j + 1] <= a[i]:
+            j += 2
+        else:
+            return True
+    return False
+
+
+class CycleError(ValueError):
+    """Raised when a parent link would make someone their own ancestor."""
+
 
-@dataclass
 class Person:
-    name: str
-    parents: Set[str] = field(default_factory=set)
-    children: Set[str] = field(default_factory=set)
-    meta: Dict = field(default_factory=dict)
+    __slots__ = ("name", "parents", "children", "meta")
+
+    def __init__(self, name: str, parents: Optional[Set[str]] = None,
+                 children: Optional[Set[str]] = None, meta: Optional[Dict] = None):
+        self.name = name
+        self.parents: Set[str] = parents if parents is not None else set()
+        self.children: Set[str] = children if children is not None else set()
+        self.meta: Dict = meta if meta is not None else {}
+
+    def __repr__(self) -> str:
+        return (f"Person(name={self.name!r}, parents={self.parents!r}, "
+                f"children={self.children!r}, meta={self.meta!r})")
+
+
+class AncestorPaths(Mapping):
+    """Read-only ``{ancestor: (generations, path)}`` view over a BFS result.
+
+    Only back-pointers are stored; the name path for an ancestor is rebuilt
+    when that ancestor is looked up.
+    """
+
+    def __init__(self, ids: Dict[str, int], names: List[str], dist: Dict[int, int], via: Dict[int, int]):
+        self._ids = ids
+        self._names = names
+        self._dist = dist
+        self._via = via
+
+    def path(self, target: int) -> List[str]:
+        names = self._names
+        via = self._via
+        path = [names[target]]
+        while target in via:
+            target = via[target]
+            path.append(names[target])
+        path.reverse()
+        return path
+
+    def __getitem__(self, name: str) -> Tuple[int, List[str]]:
+        i = self._ids.get(name)
+        if i is None or i not in self._dist:
+            raise KeyError(name)
+        return self._dist[i], self.path(i)
+
+    def __iter__(self) -> Iterator[str]:
+        names = self._names
+        return (names[a] for a in self._dist)
+
+    def __len__(self) -> int:
+        return len(self._dist)
+
 
 class FamilyTree:
-    def __init__(self):
-        self.nodes: Dict[str, Person] = {}
+    """Parent/child DAG keyed by name.
+
+    Names are interned to dense integer ids and the adjacency is kept in
+    CSR form: the parents of node ``i`` are ``_par_adj[_par_off[i]:_par_off[i + 1]]``
+    (likewise for children).  Edges added after the last compaction live in
+    small per-node overflow lists until enough accumulate to repack.
+    """
+
+    def __init__(self, reachability_index: bool = False):
+        self._reachability = reachability_index
+        # Bumped on every change (never reset), so (id(tree), version) keys caches.
+        self._version = 0
+        self.clear()
+
+    def clear(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._meta: Dict[int, Dict] = {}
+        self._par_off = array(_ID_TYPE, [0])
+        self._par_adj = array(_ID_TYPE)
+        self._child_off = array(_ID_TYPE, [0])
+        self._child_adj = array(_ID_TYPE)
+        self._extra_parents: Dict[int, List[int]] = {}
+        self._extra_children: Dict[int, List[int]] = {}
+        self._num_extra = 0
+        # Generation level: length of the longest parent chain above a node
+        # (founders are 0), so every ancestor sits on a strictly lower level.
+        self._level = array(_ID_TYPE)
+        # Optional reachability index: per-node ancestor closure as id runs.
+        self._closure: Optional[List[array]] = [] if self._reachability else None
+        # Set while the arrays above are zero-copy views into a snapshot file.
+        self._mmap: Optional[mmap.mmap] = None
+        self._topo: Optional[Tuple[int, array]] = None
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def _ensure(self, name: str) -> int:
+        i = self._ids.get(name)
+        if i is None:
+            i = len(self._names)
+            self._ids[name] = i
+            self._names.append(name)
+            self._level.append(0)
+            self._version += 1
+            if self._closure is not None:
+                self._closure.append(_NO_RUNS)
+        return i
+
+    def _parent_ids(self, i: int) -> Sequence[int]:
+        off = self._par_off
+        ids = self._par_adj[off[i]:off[i + 1]] if i + 1 < len(off) else ()
+        extra = self._extra_parents.get(i)
+        return [*ids, *extra] if extra else ids
+
+    def _child_ids(self, i: int) -> Sequence[int]:
+        off = self._child_off
+        ids = self._child_adj[off[i]:off[i + 1]] if i + 1 < len(off) else ()
+        extra = self._extra_children.get(i)
+        return [*ids, *extra] if extra else ids
+
+    def _add_edge(self, p: int, c: int):
+        if p in self._parent_ids(c):
+            return
+        if self._level[c] <= self._level[p]:
+            self._raise_levels(p, c)
+        self._extra_parents.setdefault(c, []).append(p)
+        self._extra_children.setdefault(p, []).append(c)
+        self._num_extra += 1
+        self._version += 1
+        if self._closure is not None:
+            self._extend_closure(p, c)
+        if self._num_extra > max(_COMPACT_MIN_EDGES, len(self._par_adj) // 4):
+            self.compact()
+
+    def _raise_levels(self, p: int, c: int):
+        # Push the new level down through c's descendants before touching any
+        # state, so an edge that would close a cycle is rejected cleanly.
+        if p == c:
+            raise CycleError(f"{self._names[p]!r} cannot be their own parent")
+        level = self._level
+        raised = {c: level[p] + 1}
+        stack = [c]
+        while stack:
+            cur = stack.pop()
+            new_level = raised[cur] + 1
+            for ch in self._child_ids(cur):
+                if ch == p:
+                    raise CycleError(f"{self._names[c]!r} is already an ancestor of {self._names[p]!r}")
+                if level[ch] < new_level and raised.get(ch, -1) < new_level:
+                    raised[ch] = new_level
+                    stack.append(ch)
+        for i, lvl in raised.items():
+            level[i] = lvl
+
+    def _extend_closure(self, p: int, c: int):
+        closure = self._closure
+        delta = array(_ID_TYPE, closure[p])
+        _runs_insert(delta, p, p + 1)
+        stack = [c]
+        while stack:
+            x = stack.pop()
+            merged = _runs_union(closure[x], delta)
+            # Descendants of a node that already had every new ancestor have them too.
+            if merged != closure[x]:
+                closure[x] = merged
+                stack.extend(self._child_ids(x))
+
+    def enable_reachability_index(self):
+        self._reachability = True
+        closure: List[array] = [_NO_RUNS] * len(self._names)
+        for x in self._topological_ids():
+            runs = None
+            for p in self._parent_ids(x):
+                if runs is None:
+                    runs = array(_ID_TYPE, closure[p])
+                else:
+                    runs = _runs_union(runs, closure[p])
+                _runs_insert(runs, p, p + 1)
+            closure[x] = runs if runs is not None else _NO_RUNS
+        self._closure = closure
+
+    def disable_reachability_index(self):
+        self._reachability = False
+        self._closure = None
 
-    def _ensure(self, name: str) -> Person:
-        if name not in self.nodes:
-            self.nodes[name] = Person(name=name)
-        return self.nodes[name]
+    @staticmethod
+    def _repack(off: array, adj: array, extra: Dict[int, List[int]], n: int) -> Tuple[array, array]:
+        new_off = array(_ID_TYPE, [0])
+        new_adj = array(_ID_TYPE)
+        packed = len(off) - 1
+        for i in range(n):
+            if i < packed:
+                new_adj.extend(adj[off[i]:off[i + 1]])
+            more = extra.get(i)
+            if more:
+                new_adj.extend(more)
+            new_off.append(len(new_adj))
+        return new_off, new_adj
+
+    def compact(self):
+        n = len(self._names)
+        if not self._num_extra and len(self._par_off) == n + 1:
+            return
+        self._par_off, self._par_adj = self._repack(self._par_off, self._par_adj, self._extra_parents, n)
+        self._child_off, self._child_adj = self._repack(self._child_off, self._child_adj, self._extra_children, n)
+        self._extra_parents = {}
+        self._extra_children = {}
+        self._num_extra = 0
 
     def add_person(self, name: str, parents: Optional[List[str]] = None, meta: Optional[Dict] = None):
-        p = self._ensure(name)
+        self._thaw()
+        i = self._ensure(name)
         if meta:
-            p.meta.update(meta)
+            self._meta.setdefault(i, {}).update(meta)
+            self._version += 1
         if parents:
             for par in parents:
-                par_node = self._ensure(par)
-                par_node.children.add(name)
-                p.parents.add(par)
+                self._add_edge(self._ensure(par), i)
 
     def add_parent_child(self, parent: str, child: str):
-        self._ensure(parent).children.add(child)
-        self._ensure(child).parents.add(parent)
+        self._thaw()
+        self._add_edge(self._ensure(parent), self._ensure(child))
+
+    def get_person(self, name: str) -> Optional[Person]:
+        i = self._ids.get(name)
+        if i is None:
+            return None
+        return Person(name=name, parents=set(self.get_parents(name)),
+                      children=set(self.get_children(name)), meta=self.get_meta(name))
+
+    def get_meta(self, name: str) -> Dict:
+        i = self._ids.get(name)
+        if i is None:
+            return {}
+        return self._meta.get(i, {})
+
+    def get_generation(self, name: str) -> Optional[int]:
+        i = self._ids.get(name)
+        if i is None:
+            return None
+        return self._level[i]
+
+    # Integer-id access for engines layered on the tree (see kinship.py); ids
+    # stay valid until the tree changes (``version``).
+    def person_id(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def parent_ids(self, i: int) -> Sequence[int]:
+        return self._parent_ids(i)
+
+    def generation_of(self, i: int) -> int:
+        return self._level[i]
+
+    def _topological_ids(self) -> array:
+        # Sorting by generation level puts every parent before its children;
+        # cached until the next change.
+        if self._topo is None or self._topo[0] != self._version:
+            level = self._level
+            self._topo = (self._version, array(_ID_TYPE, sorted(range(len(level)), key=level.__getitem__)))
+        return self._topo[1]
+
+    def topological_order(self) -> List[str]:
+        names = self._names
+        return [names[i] for i in self._topological_ids()]
 
     def get_parents(self, name: str) -> List[str]:
-        if name not in self.nodes:
+        i = self._ids.get(name)
+        if i is None:
             return []
-        return list(self.nodes[name].parents)
+        names = self._names
+        return [names[p] for p in self._parent_ids(i)]
 
     def get_children(self, name: str) -> List[str]:
-        if name not in self.nodes:
+        i = self._ids.get(name)
+        if i is None:
             return []
-        return list(self.nodes[name].children)
+        names = self._names
+        return [names[c] for c in self._child_ids(i)]
 
-    def _bfs_ancestors(self, name: str, max_generations: Optional[int] = None) -> Dict[str, Tuple[int, List[str]]]:
-        if name not in self.nodes:
-            return {}
-        results: Dict[str, Tuple[int, List[str]]] = {}
-        q = deque()
-        q.append((name, 0, [name]))
-        visited = set([name])
-        while q:
-            cur, dist, path = q.popleft()
-            if max_generations is not None and dist >= max_generations:
-                continue
-            for par in self.get_parents(cur):
-                if par in visited:
-                    # still record if path shorter isn't necessary here
-                    pass
-                visited.add(par)
-                new_path = path + [par]
-                gen = dist + 1
-                if par not in results or gen < results[par][0]:
-                    results[par] = (gen, new_path)
-                q.append((par, gen, new_path))
-        return results
+    def get_siblings(self, name: str) -> List[str]:
+        """Everyone sharing at least one parent with ``name``, sorted."""
+        i = self._ids.get(name)
+        if i is None:
+            return []
+        sibs = {c for p in self._parent_ids(i) for c in self._child_ids(p)}
+        sibs.discard(i)
+        names = self._names
+        return sorted(names[c] for c in sibs)
+
+    def _bfs_ancestors(self, start: int, max_generations: Optional[int] = None) -> Tuple[Dict[int, int], Dict[int, int]]:
+        # Each ancestor is expanded once; via[a] is the child through which a
+        # was first reached, so any shortest path can be rebuilt on demand.
+        dist: Dict[int, int] = {start: 0}
+        via: Dict[int, int] = {}
+        frontier = [start]
+        gen = 0
+        while frontier and (max_generations is None or gen < max_generations):
+            gen += 1
+            nxt = []
+            for cur in frontier:
+                for par in self._parent_ids(cur):
+                    if par not in dist:
+                        dist[par] = gen
+                        via[par] = cur
+                        nxt.append(par)
+            frontier = nxt
+        del dist[start]
+        return dist, via
+
+    def _generations(self, start: int, upward: bool, max_generations: Optional[int]) -> Iterator[Tuple[int, List[int]]]:
+        # Level-synchronous traversal: gather the whole next frontier from the
+        # CSR arrays, then dedupe it against everything seen with set
+        # operations, instead of testing edges one at a time.
+        if upward:
+            off, adj, extra = self._par_off, self._par_adj, self._extra_parents
+        else:
+            off, adj, extra = self._child_off, self._child_adj, self._extra_children
+        packed = len(off) - 1
+        seen = {start}
+        frontier = [start]
+        gen = 0
+        while max_generations is None or gen < max_generations:
+            gathered = array(_ID_TYPE)
+            for i in frontier:
+                if i < packed:
+                    gathered.extend(adj[off[i]:off[i + 1]])
+                more = extra.get(i)
+                if more:
+                    gathered.extend(more)
+            nxt = set(gathered)
+            nxt -= seen
+            if not nxt:
+                return
+            seen |= nxt
+            gen += 1
+            frontier = list(nxt)
+            yield gen, frontier
+
+    def iter_ancestor_generations(self, name: str, max_generations: Optional[int] = None) -> Iterator[Tuple[int, List[str]]]:
+        """Yield ``(generations_back, [names])`` one generation at a time."""
+        start = self._ids.get(name)
+        if start is None:
+            return
+        names = self._names
+        for gen, frontier in self._generations(start, True, max_generations):
+            yield gen, [names[i] for i in frontier]
+
+    def iter_descendant_generations(self, name: str, max_generations: Optional[int] = None) -> Iterator[Tuple[int, List[str]]]:
+        """Yield ``(generations_forward, [names])`` one generation at a time."""
+        start = self._ids.get(name)
+        if start is None:
+            return
+        names = self._names
+        for gen, frontier in self._generations(start, False, max_generations):
+            yield gen, [names[i] for i in frontier]
 
     def get_ancestors(self, name: str, max_generations: Optional[int] = None) -> Dict[str, int]:
-        raw = self._bfs_ancestors(name, max_generations=max_generations)
-        return {k: v[0] for k, v in raw.items()}
+        return {a: gen for gen, level in self.iter_ancestor_generations(name, max_generations) for a in level}
 
-    def get_ancestors_with_paths(self, name: str, max_generations: Optional[int] = None) -> Dict[str, Tuple[int, List[str]]]:
-        return self._bfs_ancestors(name, max_generations=max_generations)
+    def get_ancestors_with_paths(self, name: str, max_generations: Optional[int] = None) -> Mapping[str, Tuple[int, List[str]]]:
+        start = self._ids.get(name)
+        if start is None:
+            return {}
+        dist, via = self._bfs_ancestors(start, max_generations=max_generations)
+        return AncestorPaths(self._ids, self._names, dist, via)
 
-    def get_ancestor_path(self, name: str, ancestor: str) -> Optional[List[str]]:
-        raw = self._bfs_ancestors(name)
-        if ancestor in raw:
-            return raw[ancestor][1]
+    def get_ancestor_path(self, name: str, ancestor: str, max_generations: Optional[int] = None) -> Optional[List[str]]:
+        start = self._ids.get(name)
+        target = self._ids.get(ancestor)
+        if start is None or target is None or start == target:
+            return None
+        ids = self._path_ids(start, target, max_generations)
+        if ids is None:
+            return None
+        names = self._names
+        return [names[i] for i in ids]
+
+    def _path_ids(self, start: int, target: int, max_generations: Optional[int] = None) -> Optional[List[int]]:
+        # Bidirectional BFS: parents-ward from start, children-ward from target,
+        # always growing the smaller frontier by one whole level.  The first
+        # level that touches the other side holds the shortest meeting point.
+        # Levels prune both sides: nodes between the two endpoints must sit
+        # strictly between their generation levels.
+        level = self._level
+        lo, hi = level[target], level[start]
+        if lo >= hi:
+            return None
+        # With the closure index the search also stays inside the corridor of
+        # nodes that are both descendants of target and ancestors of start.
+        closure = self._closure
+        if closure is not None and not _runs_contains(closure[start], target):
+            return None
+        up_via: Dict[int, int] = {start: -1}
+        down_via: Dict[int, int] = {target: -1}
+        up_dist: Dict[int, int] = {start: 0}
+        down_dist: Dict[int, int] = {target: 0}
+        up_frontier = [start]
+        down_frontier = [target]
+        up_gen = down_gen = 0
+        while up_frontier and down_frontier:
+            if max_generations is not None and up_gen + down_gen >= max_generations:
+                return None
+            grow_up = len(up_frontier) <= len(down_frontier)
+            if grow_up:
+                up_gen += 1
+                frontier, via, dist, gen = up_frontier, up_via, up_dist, up_gen
+                other, step = down_dist, self._parent_ids
+            else:
+                down_gen += 1
+                frontier, via, dist, gen = down_frontier, down_via, down_dist, down_gen
+                other, step = up_dist, self._child_ids
+            nxt = []
+            best = None
+            for cur in frontier:
+                for nb in step(cur):
+                    if nb in via:
+                        continue
+                    if nb not in other:
+                        if not lo < level[nb] < hi:
+                            continue
+                        if closure is not None and not (_runs_contains(closure[nb], target) if grow_up
+                                                        else _runs_contains(closure[start], nb)):
+                            continue
+                    via[nb] = cur
+                    dist[nb] = gen
+                    nxt.append(nb)
+                    if nb in other and (best is None or other[nb] < other[best]):
+                        best = nb
+            if best is not None:
+                path = []
+                node = best
+                while node != -1:
+                    path.append(node)
+                    node = up_via[node]
+                path.reverse()
+                node = down_via[best]
+                while node != -1:
+                    path.append(node)
+                    node = down_via[node]
+                return path
+            if grow_up:
+                up_frontier = nxt
+            else:
+                down_frontier = nxt
         return None
 
+    def ancestor_distance(self, name: str, ancestor: str) -> Optional[int]:
+        path = self.get_ancestor_path(name, ancestor)
+        return len(path) - 1 if path else None
+
+    def is_ancestor(self, ancestor: str, name: str) -> bool:
+        a = self._ids.get(ancestor)
+        x = self._ids.get(name)
+        if a is None or x is None:
+            return False
+        if self._closure is not None:
+            return _runs_contains(self._closure[x], a)
+        return self.ancestor_distance(name, ancestor) is not None
+
+    def find_common_ancestor(self, name1: str, name2: str) -> Optional[Tuple[str, int, int]]:
+        a = self._ids.get(name1)
+        b = self._ids.get(name2)
+        if a is None or b is None:
+            return None
+        if self._closure is not None and not _runs_overlap(self._closure[a], self._closure[b]):
+            return None
+        found = self._closest_common_ancestor(a, b)
+        if found is None:
+            return None
+        anc, d1, d2 = found
+        return self._names[anc], d1, d2
+
+    def _closest_common_ancestor(self, a: int, b: int) -> Optional[Tuple[int, int, int]]:
+        # Climb from both people a level at a time, always advancing the
+        # shallower side.  A common ancestor not yet seen by both sides is at
+        # least (shallowest open depth + 2) away in total, so the climb stops
+        # as soon as the best meeting point found so far is that close.
+        dists = ({a: 0}, {b: 0})
+        frontiers = [[a], [b]]
+        gens = [0, 0]
+        best: Optional[Tuple[int, int, int, int]] = None
+        while True:
+            open_sides = [side for side in (0, 1) if frontiers[side]]
+            if not open_sides:
+                break
+            if best is not None and best[0] <= min(gens[side] for side in open_sides) + 2:
+                break
+            side = min(open_sides, key=lambda s: (gens[s], len(frontiers[s])))
+            gens[side] += 1
+            gen = gens[side]
+            dist, other = dists[side], dists[1 - side]
+            nxt = []
+            for cur in frontiers[side]:
+                for par in self._parent_ids(cur):
+                    if par in dist:
+                        continue
+                    dist[par] = gen
+                    nxt.append(par)
+                    # A zero distance is the other person themselves, not a shared ancestor.
+                    other_gen = other.get(par)
+                    if other_gen and (best is None or gen + other_gen < best[0]):
+                        d1, d2 = (gen, other_gen) if side == 0 else (other_gen, gen)
+                        best = (gen + other_gen, par, d1, d2)
+            frontiers[side] = nxt
+        if best is None:
+            return None
+        return best[1], best[2], best[3]
+
     def get_descendants(self, name: str, max_generations: Optional[int] = None) -> Dict[str, int]:
-        if name not in self.nodes:
-            return {}
-        results: Dict[str, int] = {}
-        q = deque([(name, 0)])
-        visited = set([name])
-        while q:
-            cur, dist = q.popleft()
-            if max_generations is not None and dist >= max_generations:
+        return {d: gen for gen, level in self.iter_descendant_generations(name, max_generations) for d in level}
+
+    def _sweep(self, starts: Iterable[int], upward: bool, max_generations: Optional[int]) -> Dict[int, Dict[int, int]]:
+        # Multi-source sweep in topological order: every reached node carries
+        # {start: distance} for all starts that reach it, and hands that map on
+        # to its parents (or children) once all of its own contributors are
+        # done.  Ordering by generation level guarantees that, so each node is
+        # expanded once no matter how many starts share it.
+        level = self._level
+        step = self._parent_ids if upward else self._child_ids
+        sign = -1 if upward else 1
+        carried: Dict[int, Dict[int, int]] = {}
+        heap = []
+        for s in starts:
+            if s not in carried:
+                carried[s] = {s: 0}
+                heap.append((sign * level[s], s))
+        heapq.heapify(heap)
+        results: Dict[int, Dict[int, int]] = {s: {} for s in carried}
+        while heap:
+            _, cur = heapq.heappop(heap)
+            reach = carried.pop(cur)
+            for s, d in reach.items():
+                if d:
+                    results[s][cur] = d
+            nbs = step(cur)
+            if not nbs:
                 continue
-            for ch in self.get_children(cur):
-                if ch in visited:
+            if max_generations is None:
+                reach = {s: d + 1 for s, d in reach.items()}
+            else:
+                reach = {s: d + 1 for s, d in reach.items() if d < max_generations}
+                if not reach:
                     continue
-                visited.add(ch)
-                gen = dist + 1
-                results[ch] = gen
-                q.append((ch, gen))
+            for nb in nbs:
+                into = carried.get(nb)
+                if into is None:
+                    carried[nb] = reach.copy()
+                    heapq.heappush(heap, (sign * level[nb], nb))
+                    continue
+                for s, d in reach.items():
+                    known = into.get(s)
+                    if known is None or d < known:
+                        into[s] = d
         return results
 
-    def export_json(self) -> Dict:
-        data = {}
-        for name, person in self.nodes.items():
-            data[name] = {
-                "parents": list(person.parents),
-                "children": list(person.children),
-                "meta": person.meta,
+    def _many(self, names: Iterable[str], upward: bool, max_generations: Optional[int]) -> Dict[str, Dict[str, int]]:
+        names = list(names)
+        ids = self._ids
+        found = self._sweep((i for i in map(ids.get, names) if i is not None), upward, max_generations)
+        all_names = self._names
+        out: Dict[str, Dict[str, int]] = {}
+        for name in names:
+            i = ids.get(name)
+            out[name] = {} if i is None else {all_names[a]: d for a, d in found[i].items()}
+        return out
+
+    def ancestors_of_many(self, names: Iterable[str], max_generations: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """``{name: get_ancestors(name)}`` for every name, from one shared sweep."""
+        return self._many(names, True, max_generations)
+
+    def descendants_of_many(self, names: Iterable[str], max_generations: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """``{name: get_descendants(name)}`` for every name, from one shared sweep."""
+        return self._many(names, False, max_generations)
+
+    def relationship(self, name1: str, name2: str) -> Tuple:
+        """Classify how ``name2`` relates to ``name1``.
+
+        Returns one of ``("unknown",)``, ``("same",)``, ``("parent",)``,
+        ``("child",)``, ``("sibling",)``, ``("ancestor", gens)``,
+        ``("descendant", gens)``, ``("common_ancestor", name, gens1, gens2)``
+        or ``("none",)``, checked in that order.
+        """
+        return self.relationships([(name1, name2)])[0]
+
+    def relationships(self, pairs: Iterable[Tuple[str, str]]) -> List[Tuple]:
+        """``relationship`` for many pairs, sharing one ancestor sweep between them."""
+        pairs = list(pairs)
+        ids = self._ids
+        if len(pairs) == 1:
+            # A single pair is cheaper through the level/closure-pruned searches.
+            return [self._relationship(ids.get(pairs[0][0]), ids.get(pairs[0][1]), None)]
+        people = {i for pair in pairs for i in map(ids.get, pair) if i is not None}
+        ancestors = self._sweep(people, True, None)
+        return [self._relationship(ids.get(a), ids.get(b), ancestors) for a, b in pairs]
+
+    def _relationship(self, a: Optional[int], b: Optional[int], ancestors: Optional[Dict[int, Dict[int, int]]]) -> Tuple:
+        if a is None or b is None:
+            return ("unknown",)
+        if a == b:
+            return ("same",)
+        parents_a = self._parent_ids(a)
+        if b in parents_a:
+            return ("parent",)
+        if a in self._parent_ids(b):
+            return ("child",)
+        if any(p in parents_a for p in self._parent_ids(b)):
+            return ("sibling",)
+        names = self._names
+        if ancestors is None:
+            up = self._path_ids(a, b)
+            if up is not None:
+                return ("ancestor", len(up) - 1)
+            down = self._path_ids(b, a)
+            if down is not None:
+                return ("descendant", len(down) - 1)
+            if self._closure is not None and not _runs_overlap(self._closure[a], self._closure[b]):
+                return ("none",)
+            common = self._closest_common_ancestor(a, b)
+        else:
+            anc_a, anc_b = ancestors[a], ancestors[b]
+            if b in anc_a:
+                return ("ancestor", anc_a[b])
+            if a in anc_b:
+                return ("descendant", anc_b[a])
+            if len(anc_a) > len(anc_b):
+                anc_a, anc_b = anc_b, anc_a
+                swapped = True
+            else:
+                swapped = False
+            common = None
+            for x, d in anc_a.items():
+                other = anc_b.get(x)
+                if other is not None and (common is None or d + other < common[1] + common[2]):
+                    common = (x, other, d) if swapped else (x, d, other)
+        if common is None:
+            return ("none",)
+        return ("common_ancestor", names[common[0]], common[1], common[2])
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict]]:
+        names = self._names
+        for i, name in enumerate(names):
+            yield name, {
+                "parents": [names[p] for p in self._parent_ids(i)],
+                "children": [names[c] for c in self._child_ids(i)],
+                "meta": self._meta.get(i, {}),
             }
-        return data
+
+    def export_json(self) -> Dict:
+        return dict(self.iter_records())
 
     def save_json(self, filepath: str):
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(self.export_json(), f, indent=2, ensure_ascii=False)
 
-    def load_json(self, filepath: str):
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        self.nodes.clear()
-        for name, rec in data.items():
-            self.add_person(name, parents=rec.get("parents", []), meta=rec.get("meta", {}))
-
-# Populate the tree (same nodes as prior but with corrected module save)
-ft = FamilyTree()
-
-# Stark
-ft.add_person("Brandon the Builder")
-ft.add_person("Edwyle Stark", parents=["Brandon the Builder"])
-ft.add_person("Rickard Stark", parents=["Edwyle Stark"])
-ft.add_person("Lyarra Stark")
-ft.add_person("Brandon Stark", parents=["Rickard Stark", "Lyarra Stark"])
-ft.add_person("Eddard Stark", parents=["Rickard Stark", "Lyarra Stark"])
-ft.add_person("Lyanna Stark", parents=["Rickard Stark", "Lyarra Stark"])
-ft.add_person("Benjen Stark", parents=["Rickard Stark", "Lyarra Stark"])
-ft.add_person("Catelyn Tully")
-ft.add_person("Robb Stark", parents=["Eddard Stark", "Catelyn Tully"])
-ft.add_person("Sansa Stark", parents=["Eddard Stark", "Catelyn Tully"])
-ft.add_person("Arya Stark", parents=["Eddard Stark", "Catelyn Tully"])
-ft.add_person("Bran Stark", parents=["Eddard Stark", "Catelyn Tully"])
-ft.add_person("Rickon Stark", parents=["Eddard Stark", "Catelyn Tully"])
-ft.add_person("Jon Snow", parents=["Rhaegar Targaryen", "Lyanna Stark"])
-
-# Targaryen
-ft.add_person("Aegon I Targaryen")
-ft.add_person("Jaehaerys I Targaryen", parents=["Aegon I Targaryen"])
-ft.add_person("Aegon V Targaryen", parents=["Jaehaerys I Targaryen"])
-ft.add_person("Jaehaerys II Targaryen", parents=["Aegon V Targaryen"])
-ft.add_person("Aerys II Targaryen", parents=["Jaehaerys II Targaryen"])
-ft.add_person("Rhaella Targaryen", parents=["Jaehaerys II Targaryen"])
-ft.add_person("Rhaegar Targaryen", parents=["Aerys II Targaryen", "Rhaella Targaryen"])
-ft.add_person("Elia Martell")
-ft.add_person("Rhaenys Targaryen", parents=["Rhaegar Targaryen", "Elia Martell"])
-ft.add_person("Aegon (young) Targaryen", parents=["Rhaegar Targaryen", "Elia Martell"])
-ft.add_person("Viserys Targaryen", parents=["Aerys II Targaryen", "Rhaella Targaryen"])
-ft.add_person("Daenerys Targaryen", parents=["Aerys II Targaryen", "Rhaella Targaryen"])
-
-# Lannister
-ft.add_person("Tytos Lannister")
-ft.add_person("Joanna Lannister")
-ft.add_person("Tywin Lannister", parents=["Tytos Lannister"])
-ft.add_person("Jaime Lannister", parents=["Tywin Lannister", "Joanna Lannister"])
-ft.add_person("Cersei Lannister", parents=["Tywin Lannister", "Joanna Lannister"])
-ft.add_person("Tyrion Lannister", parents=["Tywin Lannister", "Joanna Lannister"])
-
-# Baratheon
-ft.add_person("Orys Baratheon")
-ft.add_person("Steffon Baratheon")
-ft.add_person("Robert Baratheon", parents=["Steffon Baratheon"])
-ft.add_person("Stannis Baratheon", parents=["Steffon Baratheon"])
-ft.add_person("Renly Baratheon", parents=["Steffon Baratheon"])
-
-# Tully
-ft.add_person("Hoster Tully")
-ft.add_person("Minisa Whent")
-ft.add_person("Catelyn Tully", parents=["Hoster Tully", "Minisa Whent"])
-ft.add_person("Lysa Tully", parents=["Hoster Tully", "Minisa Whent"])
-ft.add_person("Edmure Tully", parents=["Hoster Tully", "Minisa Whent"])
-ft.add_person("Robin Arryn", parents=["Lysa Tully"])
-
-# Martell
-ft.add_person("Doran Martell")
-ft.add_person("Oberyn Martell", parents=["Doran Martell"])
-ft.add_person("Elia Martell", parents=["Doran Martell"])
-
-# Tyrell
-ft.add_person("Mace Tyrell")
-ft.add_person("Olenna Tyrell")
-ft.add_person("Margaery Tyrell", parents=["Mace Tyrell", "Olenna Tyrell"])
-ft.add_person("Loras Tyrell", parents=["Mace Tyrell", "Olenna Tyrell"])
-
-# Greyjoy
-ft.add_person("Balon Greyjoy")
-ft.add_person("Theon Greyjoy", parents=["Balon Greyjoy"])
-ft.add_person("Asha Greyjoy", parents=["Balon Greyjoy"])
-
-# Arryn
-ft.add_person("Jon Arryn")
-ft.add_person("Robert Arryn", parents=["Jon Arryn", "Lysa Tully"])
-
-# Frey
-ft.add_person("Walder Frey")
-ft.add_person("Stevron Frey", parents=["Walder Frey"])
-ft.add_person("Roslin Frey", parents=["Walder Frey"])
-
-# Save JSON export and a module file
-json_path = "game_of_thrones_family_tree.json"
-ft.save_json(json_path)
-
-data_blob = json.dumps(ft.export_json(), indent=2, ensure_ascii=False)
-module_code = (
-    "# Auto-generated minimal Game of Thrones Family Tree data module\n\n"
-    "DATA_JSON = " + repr(data_blob) + "\n\n"
-    "def load_data():\n"
-    "    import json\n"
-    "    return json.loads(DATA_JSON)\n\n"
-    "if __name__ == '__main__':\n"
-    "    print('This module contains GAME OF THRONES family data (partial).\\n')\n"
-    "    d = load_data()\n"
-    "    print('Loaded', len(d), 'nodes')\n"
-)
-
-module_path = "game_of_thrones_family_tree.py"
-with open(module_path, "w", encoding="utf-8") as f:
-    f.write(module_code)
-
-# Demonstration queries
-print("=== Demo queries ===")
-print("Parents of Jon Snow ->", ft.get_parents("Jon Snow"))
-print("Children of Rhaegar Targaryen ->", ft.get_children("Rhaegar Targaryen"))
-print("Ancestors of Jon Snow (name -> generations) ->", ft.get_ancestors("Jon Snow"))
-
-anc_with_paths = ft.get_ancestors_with_paths("Jon Snow")
-print("\nAncestors of Jon Snow with paths (showing up to 10):")
-count = 0
-for anc, (gen, path) in sorted(anc_with_paths.items(), key=lambda x: (x[1][0], x[0])):
-    print(f" - {anc} : {gen} gen(s) via {' -> '.join(path)}")
-    count += 1
-    if count >= 10:
-        break
-
-print("\nPath from Jon Snow to Aegon V Targaryen:", ft.get_ancestor_path("Jon Snow", "Aegon V Targaryen"))
-print("Descendants of Aerys II Targaryen (up to 3 gen):", ft.get_descendants("Aerys II Targaryen", max_generations=3))
-
-print(f"\n✅ Files saved: {json_path} and {module_path}")
+    def save_jsonl(self, filepath: str):
+        with open(filepath, "w", encoding="utf-8") as f:
+            for name, rec in self.iter_records():
+                f.write(json.dumps({"name": name, **rec}, ensure_ascii=False))
+                f.write("\n")
+
+    def load_records(self, records: Iterable[Tuple[str, Dict]]):
+        """Replace the tree's contents with ``(name, {"parents", "meta"})`` records.
+
+        Records are consumed one at a time into flat edge arrays; the CSR
+        adjacency, generation levels (one Kahn pass, as in ``from_adjacency``)
+        and the optional closure are built once at the end, so the cost does
+        not depend on whether children are listed before their parents.
+        """
+        ids: Dict[str, int] = {}
+        names: List[str] = []
+        meta: Dict[int, Dict] = {}
+        edge_child = array(_ID_TYPE)
+        edge_parent = array(_ID_TYPE)
+
+        def intern(name: str) -> int:
+            i = ids.get(name)
+            if i is None:
+                i = ids[name] = len(names)
+                names.append(name)
+            return i
+
+        for name, rec in records:
+            c = intern(name)
+            if rec.get("meta"):
+                meta.setdefault(c, {}).update(rec["meta"])
+            for par in rec.get("parents") or ():
+                edge_child.append(c)
+                edge_parent.append(intern(par))
+        n = len(names)
+        # Counting sort by child keeps each person's parents in the order listed.
+        par_off = array(_ID_TYPE, bytes(4 * (n + 1)))
+        for c in edge_child:
+            par_off[c + 1] += 1
+        for i in range(n):
+            par_off[i + 1] += par_off[i]
+        par_adj = array(_ID_TYPE, bytes(4 * len(edge_child)))
+        fill = par_off[:-1]
+        for c, p in zip(edge_child, edge_parent):
+            par_adj[fill[c]] = p
+            fill[c] += 1
+        del edge_child, edge_parent, fill
+        par_off, par_adj = self._dedupe_segments(par_off, par_adj)
+        self.clear()
+        self._ids, self._names, self._meta = ids, names, meta
+        self._install_parents(par_off, par_adj)
+        if self._reachability:
+            self.enable_reachability_index()
+
+    @staticmethod
+    def _dedupe_segments(off: array, adj: array) -> Tuple[array, array]:
+        # A parent listed twice for someone (or in two records for them) is one edge.
+        n = len(off) - 1
+        if not any(off[i + 1] - off[i] > 1 and len(set(adj[off[i]:off[i + 1]])) < off[i + 1] - off[i]
+                   for i in range(n)):
+            return off, adj
+        new_off = array(_ID_TYPE, [0])
+        new_adj = array(_ID_TYPE)
+        for i in range(n):
+            new_adj.extend(dict.fromkeys(adj[off[i]:off[i + 1]]))
+            new_off.append(len(new_adj))
+        return new_off, new_adj
+
+    def load_dict(self, data: Dict):
+        self.load_records(data.items())
+
+    def load_json(self, filepath: str, progress: Optional[Callable[[int, int], None]] = None):
+        """Stream ``filepath`` (a JSON object or JSON Lines) into the tree.
+
+        Records are parsed and inserted one at a time, so memory stays bounded
+        by the tree itself rather than by the size of the file.
+        """
+        self.load_records(iter_json_records(filepath, progress=progress))
+
+    @classmethod
+    def from_adjacency(cls, names: Sequence[str], parents: Sequence[Sequence[int]],
+                       meta: Optional[Mapping[int, Dict]] = None, reachability_index: bool = False) -> "FamilyTree":
+        """Build a compacted tree directly from index-based parent lists.
+
+        ``parents[i]`` holds the indices of ``names[i]``'s parents.  Children,
+        generation levels and the optional closure are derived in linear passes
+        instead of replaying ``add_person`` edge by edge.
+        """
+        n = len(names)
+        tree = cls(reachability_index=False)
+        tree._names = list(names)
+        tree._ids = {name: i for i, name in enumerate(tree._names)}
+        if len(tree._ids) != n:
+            raise ValueError("duplicate names")
+        tree._meta = {i: dict(m) for i, m in (meta or {}).items() if m}
+        par_off = array(_ID_TYPE, [0])
+        par_adj = array(_ID_TYPE)
+        for ps in parents:
+            par_adj.extend(ps)
+            par_off.append(len(par_adj))
+        tree._install_parents(par_off, par_adj)
+        if reachability_index:
+            tree.enable_reachability_index()
+        return tree
+
+    def _install_parents(self, par_off: array, par_adj: array):
+        # Derive the children CSR and generation levels from packed parent lists.
+        n = len(par_off) - 1
+        child_off = array(_ID_TYPE, bytes(4 * (n + 1)))
+        for p in par_adj:
+            child_off[p + 1] += 1
+        for i in range(n):
+            child_off[i + 1] += child_off[i]
+        child_adj = array(_ID_TYPE, bytes(4 * len(par_adj)))
+        fill = child_off[:-1]
+        for c in range(n):
+            for p in par_adj[par_off[c]:par_off[c + 1]]:
+                child_adj[fill[p]] = c
+                fill[p] += 1
+        self._par_off, self._par_adj = par_off, par_adj
+        self._child_off, self._child_adj = child_off, child_adj
+        # Kahn's algorithm: levels in one pass, and anything left over is a cycle.
+        level = array(_ID_TYPE, bytes(4 * n))
+        pending = [par_off[i + 1] - par_off[i] for i in range(n)]
+        ready = [i for i in range(n) if not pending[i]]
+        seen = 0
+        while ready:
+            x = ready.pop()
+            seen += 1
+            for c in child_adj[child_off[x]:child_off[x + 1]]:
+                if level[c] <= level[x]:
+                    level[c] = level[x] + 1
+                pending[c] -= 1
+                if not pending[c]:
+                    ready.append(c)
+        if seen != n:
+            raise CycleError("parent links contain a cycle")
+        self._level = level
+        self._version += 1
+
+    def save_snapshot(self, filepath: str, source: Optional[Tuple[int, int]] = None):
+        """Write a binary snapshot that ``open_snapshot`` can map without parsing.
+
+        Layout: a fixed header, then 8-byte aligned sections holding the name
+        string table (offsets + UTF-8 blob + name-sorted id permutation),
+        generation levels, parent/child CSR arrays, per-node meta JSON and,
+        when the reachability index is on, the closure runs.
+
+        ``source`` is the ``(st_mtime_ns, st_size)`` of the file the tree was
+        loaded from; it is kept in the header (see ``snapshot_source``) so a
+        reader can tell whether the snapshot still matches that file.
+        """
+        self.compact()
+        n = len(self._names)
+        encoded = [name.encode("utf-8") for name in self._names]
+        name_off = array("q", [0])
+        for b in encoded:
+            name_off.append(name_off[-1] + len(b))
+        by_name = array(_ID_TYPE, sorted(range(n), key=encoded.__getitem__))
+        meta_off = array("q", [0])
+        meta_parts = []
+        for i in range(n):
+            meta = self._meta.get(i)
+            if meta:
+                meta_parts.append(json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+                meta_off.append(meta_off[-1] + len(meta_parts[-1]))
+            else:
+                meta_off.append(meta_off[-1])
+        closure_off = array("q", [0])
+        closure_runs = array(_ID_TYPE)
+        flags = 0
+        if source is not None:
+            flags |= _SNAP_HAS_SOURCE
+        source_mtime, source_size = source or (0, 0)
+        if self._closure is not None:
+            flags |= _SNAP_HAS_CLOSURE
+            for runs in self._closure:
+                closure_runs.extend(runs)
+                closure_off.append(len(closure_runs))
+        sections = [
+            name_off, b"".join(encoded), by_name, self._level,
+            self._par_off, self._par_adj, self._child_off, self._child_adj,
+            meta_off, b"".join(meta_parts), closure_off, closure_runs,
+        ]
+        tmp = f"{filepath}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(bytes(_SNAP_HEADER.size))
+            spans = []
+            for data in sections:
+                f.write(bytes(-f.tell() % 8))
+                spans.append((f.tell(), len(memoryview(data).cast("B"))))
+                f.write(data)
+            f.seek(0)
+            f.write(_SNAP_HEADER.pack(_SNAP_MAGIC, n, flags, _NATIVE_ORDER, source_mtime, source_size,
+                                      *(off for off, _ in spans), *(length for _, length in spans)))
+        os.replace(tmp, filepath)
+
+    @classmethod
+    def open_snapshot(cls, filepath: str, reachability_index: bool = False) -> "FamilyTree":
+        """Map a snapshot read-only; names, edges and meta are decoded on access.
+
+        The tree is copied into ordinary arrays the first time it is mutated.
+        Processes opening the same file share one page-cached copy.
+        """
+        with open(filepath, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm.size() < _SNAP_HEADER.size:
+            raise ValueError(f"{filepath} is not a family tree snapshot")
+        magic, n, flags, order, _, _, *spans = _SNAP_HEADER.unpack_from(mm, 0)
+        if magic != _SNAP_MAGIC:
+            raise ValueError(f"{filepath} is not a family tree snapshot")
+        if order != _NATIVE_ORDER:
+            raise ValueError(f"{filepath} was written on a machine with different byte order")
+        view = memoryview(mm)
+        offsets, lengths = spans[:_SNAP_SECTIONS], spans[_SNAP_SECTIONS:]
+
+        def section(k: int, fmt: str) -> memoryview:
+            return view[offsets[k]:offsets[k] + lengths[k]].cast(fmt)
+
+        (name_off, name_blob, by_name, level, par_off, par_adj, child_off, child_adj,
+         meta_off, meta_blob, closure_off, closure_runs) = (
+            section(k, fmt) for k, fmt in enumerate("qBiiiiiiqBqi"))
+        tree = cls(reachability_index=False)
+        tree._names = _SnapshotNames(name_off, name_blob)
+        tree._ids = _SnapshotIndex(tree._names, by_name)
+        tree._meta = _SnapshotMeta(meta_off, meta_blob)
+        tree._level = level
+        tree._par_off, tree._par_adj = par_off, par_adj
+        tree._child_off, tree._child_adj = child_off, child_adj
+        tree._mmap = mm
+        tree._version += 1
+        if reachability_index:
+            if flags & _SNAP_HAS_CLOSURE:
+                tree._reachability = True
+                tree._closure = _SnapshotClosure(closure_off, closure_runs)
+            else:
+                tree.enable_reachability_index()
+        return tree
+
+    @staticmethod
+    def snapshot_source(filepath: str) -> Optional[Tuple[int, int]]:
+        """The ``source`` signature ``save_snapshot`` recorded, or None if it was given none."""
+        with open(filepath, "rb") as f:
+            header = f.read(_SNAP_HEADER.size)
+        if len(header) < _SNAP_HEADER.size:
+            raise ValueError(f"{filepath} is not a family tree snapshot")
+        magic, _, flags, _, source_mtime, source_size = _SNAP_HEADER.unpack_from(header, 0)[:6]
+        if magic != _SNAP_MAGIC:
+            raise ValueError(f"{filepath} is not a family tree snapshot")
+        if not flags & _SNAP_HAS_SOURCE:
+            return None
+        return source_mtime, source_size
+
+    def _thaw(self):
+        if self._mmap is None:
+            return
+        n = len(self._names)
+        self._names = list(self._names)
+        self._ids = {name: i for i, name in enumerate(self._names)}
+        self._meta = self._meta.to_dict()
+        self._level = array(_ID_TYPE, self._level)
+        self._par_off, self._par_adj = array(_ID_TYPE, self._par_off), array(_ID_TYPE, self._par_adj)
+        self._child_off, self._child_adj = array(_ID_TYPE, self._child_off), array(_ID_TYPE, self._child_adj)
+        if isinstance(self._closure, _SnapshotClosure):
+            self._closure = [array(_ID_TYPE, self._closure[i]) for i in range(n)]
+        self._mmap = None
+
+
+_SNAP_MAGIC = b"FTSNAP02"
+_SNAP_SECTIONS = 12
+_SNAP_HAS_CLOSURE = 1
+_SNAP_HAS_SOURCE = 2
+_NATIVE_ORDER = 0 if sys.byteorder == "little" else 1
+# magic, node count, flags, byte order, source mtime_ns + size, section offsets + lengths
+_SNAP_HEADER = struct.Struct(f"<8sQQQqQ{2 * _SNAP_SECTIONS}Q")
+
+
+class _SnapshotNames(Sequence):
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def raw(self, i: int) -> bytes:
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+    def __getitem__(self, i: int) -> str:
+        return self.raw(i).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+
+class _SnapshotIndex:
+    """Name -> id lookup by binary search over the name-sorted id permutation."""
+
+    def __init__(self, names: _SnapshotNames, by_name: memoryview):
+        self._names = names
+        self._by_name = by_name
+
+    def get(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        # Like the dict it stands in for: a key of any other type is just not there.
+        if not isinstance(name, str):
+            return default
+        key = name.encode("utf-8")
+        lo, hi = 0, len(self._by_name)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._names.raw(self._by_name[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._by_name) and self._names.raw(self._by_name[lo]) == key:
+            return self._by_name[lo]
+        return default
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+
+class _SnapshotMeta:
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def get(self, i: int, default: Optional[Dict] = None) -> Optional[Dict]:
+        lo, hi = self._offsets[i], self._offsets[i + 1]
+        if lo == hi:
+            return default
+        return json.loads(bytes(self._blob[lo:hi]))
+
+    def to_dict(self) -> Dict[int, Dict]:
+        return {i: self.get(i) for i in range(len(self._offsets) - 1) if self._offsets[i] != self._offsets[i + 1]}
+
+
+class _SnapshotClosure(Sequence):
+    def __init__(self, offsets: memoryview, runs: memoryview):
+        self._offsets = offsets
+        self._runs = runs
+
+    def __getitem__(self, i: int) -> memoryview:
+        return self._runs[self._offsets[i]:self._offsets[i + 1]]
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+def write_data_module(records: Iterable[Tuple[str, Dict]], filepath: str):
+    """Write an importable data module holding the tree as literal tuples.
+
+    Tuples of constants are folded into the module's code object, so after the
+    first import the data comes straight out of the cached .pyc with no JSON
+    parsing. ``load_data()`` is memoised and shared (read-only); ``load_tree()``
+    builds a fresh tree per call, since callers may mutate it.
+    """
+    records = list(records)
+    index = {name: i for i, (name, _) in enumerate(records)}
+    lines = [
+        "# Auto-generated minimal Game of Thrones Family Tree data module",
+        "",
+        "from functools import lru_cache",
+        "",
+        "NAMES = (",
+    ]
+    lines += [f"    {name!r}," for name, _ in records]
+    lines += [")", "", "# PARENTS[i] / CHILDREN[i] hold indices into NAMES.", "PARENTS = ("]
+    lines += [f"    {tuple(index[p] for p in rec.get('parents', []))!r}," for _, rec in records]
+    lines += [")", "", "CHILDREN = ("]
+    lines += [f"    {tuple(index[c] for c in rec.get('children', []))!r}," for _, rec in records]
+    lines += [")", "", "# Sparse: only people with metadata appear here.", "META = {"]
+    lines += [f"    {i}: {rec['meta']!r}," for i, (_, rec) in enumerate(records) if rec.get("meta")]
+    lines += ["}", ""]
+    lines += [
+        "",
+        "@lru_cache(maxsize=None)",
+        "def load_data():",
+        '    """Return ``{name: {"parents", "children", "meta"}}`` (built once; do not mutate)."""',
+        "    return {",
+        "        name: {",
+        '            "parents": [NAMES[p] for p in PARENTS[i]],',
+        '            "children": [NAMES[c] for c in CHILDREN[i]],',
+        '            "meta": META.get(i, {}),',
+        "        }",
+        "        for i, name in enumerate(NAMES)",
+        "    }",
+        "",
+        "",
+        "def load_tree():",
+        '    """Return a new got.FamilyTree built straight from the index tuples (cheap; safe to mutate)."""',
+        "    from got import FamilyTree",
+        "    return FamilyTree.from_adjacency(NAMES, PARENTS, META)",
+        "",
+        "",
+        "if __name__ == '__main__':",
+        "    print('This module contains GAME OF THRONES family data (partial).\\n')",
+        "    d = load_data()",
+        "    print('Loaded', len(d), 'nodes')",
+        "",
+    ]
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+_CHUNK_SIZE = 1 << 16
+_PROGRESS_EVERY = 10000
+
+
+class _ChunkReader:
+    """Incrementally decoded UTF-8 text buffer over a binary file."""
+
+    def __init__(self, f, chunk_size: int):
+        self._f = f
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.bytes_read = 0
+        self.eof = False
+
+    def fill(self, min_size: int = 0) -> bool:
+        if self.eof:
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        raw = self._f.read(max(self.chunk_size, min_size))
+        self.bytes_read += len(raw)
+        if not raw:
+            self.eof = True
+            self.buf += self._decoder.decode(b"", final=True)
+            return False
+        self.buf += self._decoder.decode(raw)
+        return True
+
+    def skip_ws(self) -> str:
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        ch = self.skip_ws()
+        if not ch or ch not in chars:
+            raise ValueError(f"expected one of {chars!r} at byte ~{self.bytes_read}, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def decode_value(self, decoder: json.JSONDecoder):
+        self.skip_ws()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value runs past the buffer; grow geometrically.
+                if not self.fill(len(self.buf) - self.pos):
+                    raise
+                continue
+            # A bare number cut off at the buffer edge would still parse.
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_records(filepath: str, progress: Optional[Callable[[int, int], None]] = None,
+                      chunk_size: int = _CHUNK_SIZE) -> Iterator[Tuple[str, Dict]]:
+    """Yield ``(name, record)`` pairs from a family-tree export without loading it whole.
+
+    ``.jsonl``/``.ndjson`` files hold one ``{"name": ..., "parents": [...], ...}``
+    object per line; anything else is read as the ``{name: record}`` object
+    written by ``save_json``.  ``progress(records, bytes_read)`` is called every
+    few thousand records and once at the end.
+    """
+    count = 0
+    with open(filepath, "rb") as f:
+        if filepath.endswith((".jsonl", ".ndjson")):
+            records = _iter_json_lines(f)
+        else:
+            records = _iter_object_items(_ChunkReader(f, chunk_size))
+        for name, rec in records:
+            yield name, rec
+            count += 1
+            if progress is not None and count % _PROGRESS_EVERY == 0:
+                progress(count, f.tell())
+        if progress is not None:
+            progress(count, f.tell())
+
+
+def _iter_json_lines(f) -> Iterator[Tuple[str, Dict]]:
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        rec = json.loads(line)
+        yield rec.pop("name"), rec
+
+
+def _iter_object_items(reader: _ChunkReader) -> Iterator[Tuple[str, Dict]]:
+    decoder = json.JSONDecoder()
+    reader.expect("{")
+    if reader.skip_ws() == "}":
+        return
+    while True:
+        key = reader.decode_value(decoder)
+        reader.expect(":")
+        value = reader.decode_value(decoder)
+        yield key, value
+        if reader.expect(",}") == "}":
+            return
+
+
+def build_got_tree() -> FamilyTree:
+    # Same nodes as prior but with corrected module save
+    ft = FamilyTree()
+
+    # Stark
+    ft.add_person("Brandon the Builder")
+    ft.add_person("Edwyle Stark", parents=["Brandon the Builder"])
+    ft.add_person("Rickard Stark", parents=["Edwyle Stark"])
+    ft.add_person("Lyarra Stark")
+    ft.add_person("Brandon Stark", parents=["Rickard Stark", "Lyarra Stark"])
+    ft.add_person("Eddard Stark", parents=["Rickard Stark", "Lyarra Stark"])
+    ft.add_person("Lyanna Stark", parents=["Rickard Stark", "Lyarra Stark"])
+    ft.add_person("Benjen Stark", parents=["Rickard Stark", "Lyarra Stark"])
+    ft.add_person("Catelyn Tully")
+    ft.add_person("Robb Stark", parents=["Eddard Stark", "Catelyn Tully"])
+    ft.add_person("Sansa Stark", parents=["Eddard Stark", "Catelyn Tully"])
+    ft.add_person("Arya Stark", parents=["Eddard Stark", "Catelyn Tully"])
+    ft.add_person("Bran Stark", parents=["Eddard Stark", "Catelyn Tully"])
+    ft.add_person("Rickon Stark", parents=["Eddard Stark", "Catelyn Tully"])
+    ft.add_person("Jon Snow", parents=["Rhaegar Targaryen", "Lyanna Stark"])
+
+    # Targaryen
+    ft.add_person("Aegon I Targaryen")
+    ft.add_person("Jaehaerys I Targaryen", parents=["Aegon I Targaryen"])
+    ft.add_person("Aegon V Targaryen", parents=["Jaehaerys I Targaryen"])
+    ft.add_person("Jaehaerys II Targaryen", parents=["Aegon V Targaryen"])
+    ft.add_person("Aerys II Targaryen", parents=["Jaehaerys II Targaryen"])
+    ft.add_person("Rhaella Targaryen", parents=["Jaehaerys II Targaryen"])
+    ft.add_person("Rhaegar Targaryen", parents=["Aerys II Targaryen", "Rhaella Targaryen"])
+    ft.add_person("Elia Martell")
+    ft.add_person("Rhaenys Targaryen", parents=["Rhaegar Targaryen", "Elia Martell"])
+    ft.add_person("Aegon (young) Targaryen", parents=["Rhaegar Targaryen", "Elia Martell"])
+    ft.add_person("Viserys Targaryen", parents=["Aerys II Targaryen", "Rhaella Targaryen"])
+    ft.add_person("Daenerys Targaryen", parents=["Aerys II Targaryen", "Rhaella Targaryen"])
+
+    # Lannister
+    ft.add_person("Tytos Lannister")
+    ft.add_person("Joanna Lannister")
+    ft.add_person("Tywin Lannister", parents=["Tytos Lannister"])
+    ft.add_person("Jaime Lannister", parents=["Tywin Lannister", "Joanna Lannister"])
+    ft.add_person("Cersei Lannister", parents=["Tywin Lannister", "Joanna Lannister"])
+    ft.add_person("Tyrion Lannister", parents=["Tywin Lannister", "Joanna Lannister"])
+
+    # Baratheon
+    ft.add_person("Orys Baratheon")
+    ft.add_person("Steffon Baratheon")
+    ft.add_person("Robert Baratheon", parents=["Steffon Baratheon"])
+    ft.add_person("Stannis Baratheon", parents=["Steffon Baratheon"])
+    ft.add_person("Renly Baratheon", parents=["Steffon Baratheon"])
+
+    # Tully
+    ft.add_person("Hoster Tully")
+    ft.add_person("Minisa Whent")
+    ft.add_person("Catelyn Tully", parents=["Hoster Tully", "Minisa Whent"])
+    ft.add_person("Lysa Tully", parents=["Hoster Tully", "Minisa Whent"])
+    ft.add_person("Edmure Tully", parents=["Hoster Tully", "Minisa Whent"])
+    ft.add_person("Robin Arryn", parents=["Lysa Tully"])
+
+    # Martell
+    ft.add_person("Doran Martell")
+    ft.add_person("Oberyn Martell", parents=["Doran Martell"])
+    ft.add_person("Elia Martell", parents=["Doran Martell"])
+
+    # Tyrell
+    ft.add_person("Mace Tyrell")
+    ft.add_person("Olenna Tyrell")
+    ft.add_person("Margaery Tyrell", parents=["Mace Tyrell", "Olenna Tyrell"])
+    ft.add_person("Loras Tyrell", parents=["Mace Tyrell", "Olenna Tyrell"])
+
+    # Greyjoy
+    ft.add_person("Balon Greyjoy")
+    ft.add_person("Theon Greyjoy", parents=["Balon Greyjoy"])
+    ft.add_person("Asha Greyjoy", parents=["Balon Greyjoy"])
+
+    # Arryn
+    ft.add_person("Jon Arryn")
+    ft.add_person("Robert Arryn", parents=["Jon Arryn", "Lysa Tully"])
+
+    # Frey
+    ft.add_person("Walder Frey")
+    ft.add_person("Stevron Frey", parents=["Walder Frey"])
+    ft.add_person("Roslin Frey", parents=["Walder Frey"])
+    return ft
+
+
+def main():
+    ft = build_got_tree()
+
+    # Save JSON export and a module file
+    json_path = "game_of_thrones_family_tree.json"
+    ft.save_json(json_path)
+
+    module_path = "game_of_thrones_family_tree.py"
+    write_data_module(ft.iter_records(), module_path)
+
+    # Demonstration queries
+    print("=== Demo queries ===")
+    print("Parents of Jon Snow ->", ft.get_parents("Jon Snow"))
+    print("Children of Rhaegar Targaryen ->", ft.get_children("Rhaegar Targaryen"))
+    print("Ancestors of Jon Snow (name -> generations) ->", ft.get_ancestors("Jon Snow"))
+
+    anc_with_paths = ft.get_ancestors_with_paths("Jon Snow")
+    print("\nAncestors of Jon Snow with paths (showing up to 10):")
+    count = 0
+    for anc, (gen, path) in sorted(anc_with_paths.items(), key=lambda x: (x[1][0], x[0])):
+        print(f" - {anc} : {gen} gen(s) via {' -> '.join(path)}")
+        count += 1
+        if count >= 10:
+            break
+
+    print("\nPath from Jon Snow to Aegon V Targaryen:", ft.get_ancestor_path("Jon Snow", "Aegon V Targaryen"))
+    print("Descendants of Aerys II Targaryen (up to 3 gen):", ft.get_descendants("Aerys II Targaryen", max_generations=3))
+
+    print(f"\n✅ Files saved: {json_path} and {module_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""JSON query API for the family tree, served next to the Gradio UI.
+
+    GET  /api/<query>?name=...[&name2=...][&max_gen=N][&stream=1]
+    POST /api/batch   {"queries": [{"query": "ancestors", "name": "...", "max_gen": 3}, ...]}
+
+Queries: parents, children, siblings, ancestors, descendants, relationship,
+common_ancestor. ``stream=1`` (or ``Accept: application/x-ndjson``) returns
+NDJSON: one line per generation for ancestors/descendants, one line per
+query for a batch.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from got import FamilyTree
+from query_cache import QueryCache
+
+_JSON = "application/json"
+_NDJSON = "application/x-ndjson"
+MAX_BATCH = 1000
+QUERIES = ("parents", "children", "siblings", "ancestors", "descendants", "relationship", "common_ancestor")
+_PAIR_QUERIES = ("relationship", "common_ancestor")
+
+
+class QueryError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _relationship_json(rel: Tuple) -> Dict:
+    kind = rel[0]
+    if kind in ("ancestor", "descendant"):
+        return {"kind": kind, "generations": rel[1]}
+    if kind == "common_ancestor":
+        return {"kind": kind, "ancestor": rel[1], "generations1": rel[2], "generations2": rel[3]}
+    return {"kind": kind}
+
+
+def _levels(tree: FamilyTree, query: str, name: str, max_gen: Optional[int]) -> Iterator[Dict]:
+    walk = tree.iter_ancestor_generations if query == "ancestors" else tree.iter_descendant_generations
+    for gen, names in walk(name, max_gen):
+        yield {"generation": gen, "names": sorted(names)}
+
+
+def run_query(tree: FamilyTree, query: str, name: str, name2: Optional[str] = None,
+              max_gen: Optional[int] = None):
+    """Answer one query as plain JSON-able data."""
+    if query not in QUERIES:
+        raise QueryError(400, f"unknown query {query!r}")
+    people = (("name", name), ("name2", name2)) if query in _PAIR_QUERIES else (("name", name),)
+    for label, n in people:
+        if n is None:
+            raise QueryError(400, f"{query} needs {label}")
+        if n not in tree:
+            raise QueryError(404, f"unknown person {n!r}")
+    if query == "parents":
+        return tree.get_parents(name)
+    if query == "children":
+        return sorted(tree.get_children(name))
+    if query == "siblings":
+        return tree.get_siblings(name)
+    if query in ("ancestors", "descendants"):
+        return list(_levels(tree, query, name, max_gen))
+    if query == "relationship":
+        return _relationship_json(tree.relationship(name, name2))
+    common = tree.find_common_ancestor(name, name2)
+    if common is None:
+        return None
+    return {"ancestor": common[0], "distance1": common[1], "distance2": common[2]}
+
+
+class QueryAPI:
+    """Answers queries against whatever tree ``get_tree`` currently returns,
+    keeping encoded responses in ``cache`` (shared with the UI's cache, whose
+    keys are distinct)."""
+
+    def __init__(self, get_tree: Callable[[], FamilyTree], cache: Optional[QueryCache] = None):
+        self.get_tree = get_tree
+        self.cache = cache if cache is not None else QueryCache()
+
+    @staticmethod
+    def _params(spec: Dict) -> Tuple[str, str, Optional[str], Optional[int]]:
+        max_gen = spec.get("max_gen")
+        try:
+            max_gen = int(max_gen) if max_gen not in (None, "") else None
+        except (TypeError, ValueError):
+            raise QueryError(400, f"max_gen must be an integer, got {max_gen!r}")
+        if max_gen is not None and max_gen <= 0:
+            max_gen = None
+        # Batch bodies are arbitrary JSON; anything but a string would break the
+        # tree lookups and the cache key instead of getting a 400.
+        for label in ("query", "name", "name2"):
+            value = spec.get(label)
+            if value is not None and not isinstance(value, str):
+                raise QueryError(400, f"{label} must be a string, got {value!r}")
+        return spec.get("query"), spec.get("name"), spec.get("name2"), max_gen
+
+    def answer(self, spec: Dict) -> bytes:
+        """One query as an encoded JSON object (cached)."""
+        query, name, name2, max_gen = self._params(spec)
+        tree = self.get_tree()
+
+        def compute() -> bytes:
+            result = run_query(tree, query, name, name2, max_gen)
+            return json.dumps({"query": query, "name": name, "name2": name2, "max_gen": max_gen,
+                               "result": result}, ensure_ascii=False).encode("utf-8")
+
+        return self.cache.get_or_compute(tree, ("api", query, name, name2, max_gen), compute)
+
+    def stream_levels(self, spec: Dict) -> Iterator[bytes]:
+        """Ancestors/descendants as one NDJSON line per generation, produced as the walk goes."""
+        query, name, _, max_gen = self._params(spec)
+        if query not in ("ancestors", "descendants"):
+            yield self.answer(spec) + b"\n"
+            return
+        tree = self.get_tree()
+        if name is None or name not in tree:
+            raise QueryError(404 if name is not None else 400, f"unknown person {name!r}")
+        for level in _levels(tree, query, name, max_gen):
+            yield json.dumps(level, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    def batch(self, specs: List[Dict]) -> Iterator[bytes]:
+        """Answer each query in order; a failing query yields an error object instead."""
+        for spec in specs:
+            try:
+                yield self.answer(spec)
+            except QueryError as e:
+                yield json.dumps({"query": spec.get("query"), "name": spec.get("name"), "error": str(e),
+                                  "status": e.status}, ensure_ascii=False).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    api: QueryAPI
+
+    def log_message(self, format, *args):
+        pass
+
+    def _wants_stream(self, params: Dict) -> bool:
+        return params.get("stream") in ("1", "true") or _NDJSON in self.headers.get("Accept", "")
+
+    def _send(self, status: int, body: bytes, content_type: str = _JSON):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type + "; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, e: QueryError):
+        self._send(e.status, json.dumps({"error": str(e)}, ensure_ascii=False).encode("utf-8"))
+
+    def _stream(self, lines: Iterator[bytes]):
+        # Pull the first line before committing to a 200, so bad input still gets a 4xx.
+        first = next(lines, None)
+        self.send_response(200)
+        self.send_header("Content-Type", _NDJSON + "; charset=utf-8")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        if first is not None:
+            self.wfile.write(first)
+            for line in lines:
+                self.wfile.write(line)
+        self.close_connection = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if not url.path.startswith("/api/"):
+            return self._send_error(QueryError(404, "not found"))
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        params["query"] = url.path[len("/api/"):]
+        try:
+            if self._wants_stream(params):
+                return self._stream(self.api.stream_levels(params))
+            self._send(200, self.api.answer(params))
+        except QueryError as e:
+            self._send_error(e)
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/api/batch":
+            return self._send_error(QueryError(404, "not found"))
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            specs = body.get("queries") if isinstance(body, dict) else None
+            if not isinstance(specs, list) or not all(isinstance(s, dict) for s in specs):
+                raise QueryError(400, 'expected {"queries": [{...}, ...]}')
+            if len(specs) > MAX_BATCH:
+                raise QueryError(400, f"at most {MAX_BATCH} queries per batch")
+        except QueryError as e:
+            return self._send_error(e)
+        except ValueError:
+            return self._send_error(QueryError(400, "body is not valid JSON"))
+        results = self.api.batch(specs)
+        if self._wants_stream({}):
+            return self._stream(line + b"\n" for line in results)
+        self._send(200, b'{"results": [' + b", ".join(results) + b"]}")
+
+
+def serve_api(api: QueryAPI, host: str = "127.0.0.1", port: int = 7862) -> ThreadingHTTPServer:
+    """Start the API on a daemon thread and return the server (call ``shutdown()`` to stop)."""
+    handler = type("Handler", (_Handler,), {"api": api})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="got-api", daemon=True).start()
+    return server
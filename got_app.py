@@ -1,163 +1,229 @@
 import gradio as gr
-import json
-from typing import List, Dict, Optional, Tuple
-from collections import deque
+import functools
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import BrokenExecutor, TimeoutError
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 
-# Load the family tree data
-def load_family_tree():
-    with open("game_of_thrones_family_tree.json", "r", encoding="utf-8") as f:
-        return json.load(f)
+from got import FamilyTree
+from got_api import QueryAPI, serve_api
+from got_pool import TraversalPool
+from kinship import Kinship, KinshipCoefficients, cousin_label
+from name_index import NameIndex
+from query_cache import QueryCache
+from tree_reloader import TreeReloader
 
-# Initialize the tree
-family_tree = load_family_tree()
+DATA_PATH = "game_of_thrones_family_tree.json"
+SNAPSHOT_PATH = "game_of_thrones_family_tree.snap"
+CACHE_MAX_ENTRIES = int(os.environ.get("GOT_CACHE_ENTRIES", 2048))
+CACHE_MAX_BYTES = int(os.environ.get("GOT_CACHE_BYTES", 8 << 20))
+RELOAD_INTERVAL = float(os.environ.get("GOT_RELOAD_INTERVAL", 2.0))
+# Serving limits: queued requests beyond QUEUE_MAX_SIZE are turned away, and at most
+# CONCURRENCY_LIMIT handlers (TRAVERSAL_CONCURRENCY for character queries) run at once.
+# TRAVERSAL_WORKERS > 0 moves ancestor/descendant walks into that many processes.
+QUEUE_MAX_SIZE = int(os.environ.get("GOT_QUEUE_SIZE", 512))
+CONCURRENCY_LIMIT = int(os.environ.get("GOT_CONCURRENCY", 8))
+TRAVERSAL_WORKERS = int(os.environ.get("GOT_WORKERS", 0))
+TRAVERSAL_CONCURRENCY = int(os.environ.get("GOT_TRAVERSAL_CONCURRENCY", max(2 * TRAVERSAL_WORKERS, 4)))
+QUERY_TIMEOUT = float(os.environ.get("GOT_QUERY_TIMEOUT", 10.0))
+# Ancestor/descendant answers list at most this many names (the JSON API has them all)
+RESULT_MAX_NAMES = int(os.environ.get("GOT_RESULT_MAX_NAMES", 2000))
+# How many matches the character dropdowns offer while typing
+NAME_SUGGESTIONS = int(os.environ.get("GOT_NAME_SUGGESTIONS", 100))
+# JSON/NDJSON API for machine clients (see got_api.py); 0 turns it off
+API_PORT = int(os.environ.get("GOT_API_PORT", 7862))
+# Ancestor-closure index (FamilyTree reachability_index). Off by default: the
+# level-pruned search already answers is_ancestor quickly, and the closure grows
+# superlinearly on large, interbred pedigrees (and is stored in the snapshot).
+REACHABILITY_INDEX = bool(int(os.environ.get("GOT_REACHABILITY_INDEX", 0)))
 
-# Get all character names for dropdown
-def get_all_names():
-    return sorted(family_tree.keys())
+def load_tree() -> FamilyTree:
+    """Map the binary snapshot if it was built from the current JSON, otherwise rebuild it"""
+    # The snapshot header records the JSON's (mtime, size) it was built from; comparing
+    # that, rather than the two files' mtimes, also catches a JSON replaced by an older copy
+    st = os.stat(DATA_PATH)
+    source = (st.st_mtime_ns, st.st_size)
+    try:
+        if FamilyTree.snapshot_source(SNAPSHOT_PATH) == source:
+            return FamilyTree.open_snapshot(SNAPSHOT_PATH, reachability_index=REACHABILITY_INDEX)
+    except (OSError, ValueError):
+        pass
+    ft = FamilyTree(reachability_index=REACHABILITY_INDEX)
+    ft.load_json(DATA_PATH)
+    try:
+        ft.save_snapshot(SNAPSHOT_PATH, source=source)
+    except OSError:
+        pass
+    return ft
+
+# Every query below runs on this one indexed engine (shared with got.py)
+tree = load_tree()
+
+def _build_name_index(t: FamilyTree) -> NameIndex:
+    index = NameIndex(t.names())
+    # Typo matching needs the trigram postings; build them off the request path
+    threading.Thread(target=index.warm, daemon=True).start()
+    return index
+
+# Indexes derived from `tree`, by kind
+DERIVED_INDEXES = {
+    "names": _build_name_index,
+    "kinship": Kinship,
+    "coefficients": KinshipCoefficients,
+}
+
+# kind -> (tree, version, index) for the indexes above; written under _derived_lock.
+# Each kind is built under its own lock, so a slow one never holds up the others.
+_derived: Dict[str, tuple] = {}
+_derived_lock = threading.Lock()
+_build_locks = {kind: threading.Lock() for kind in DERIVED_INDEXES}
+
+def _swap_tree(new_tree: FamilyTree):
+    """Build the derived indexes for `new_tree`, then publish it; handlers pick it up on their next call"""
+    global tree
+    built = {kind: (new_tree, new_tree.version, build(new_tree)) for kind, build in DERIVED_INDEXES.items()}
+    with _derived_lock:
+        _derived.update(built)
+        tree = new_tree
+
+def _warm_derived():
+    """Build the startup tree's derived indexes in the background (reloads build them before the swap)"""
+    for kind in DERIVED_INDEXES:
+        derived_index(kind)
+
+# Rebuilds `tree` in the background whenever the JSON file changes (started in __main__)
+reloader = TreeReloader(DATA_PATH, load_tree, tree, on_swap=_swap_tree, interval=RELOAD_INTERVAL)
+
+# Process pool for deep traversals (created in __main__ when TRAVERSAL_WORKERS > 0)
+pool: Optional[TraversalPool] = None
+
+# Rendered Markdown for repeated clicks; emptied whenever `tree` changes
+result_cache = QueryCache(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES)
+
+def cached_query(kind: str):
+    """Serve a query handler's result from `result_cache`, keyed on (kind, *args)"""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def handler(*args, **kwargs):
+            key = (kind,) + args + tuple(sorted(kwargs.items()))
+            return result_cache.get_or_compute(tree, key, lambda: fn(*args, **kwargs))
+        return handler
+    return wrap
+
+def derived_index(kind: str):
+    """The `kind` index of the current tree; built along with each reload, and rebuilt
+    here only if the tree has been changed in place since"""
+    t = tree
+    cached = _derived.get(kind)
+    if cached is None or cached[0] is not t or cached[1] != t.version:
+        # One rebuild at a time; callers that queued behind it reuse its result
+        with _build_locks[kind]:
+            cached = _derived.get(kind)
+            if cached is None or cached[0] is not t or cached[1] != t.version:
+                cached = (t, t.version, DERIVED_INDEXES[kind](t))
+                with _derived_lock:
+                    if t is tree:  # not replaced by a reload meanwhile
+                        _derived[kind] = cached
+    return cached[2]
+
+def search_names(query: str, limit: int = NAME_SUGGESTIONS) -> List[str]:
+    """Top matching character names for the dropdown type-ahead"""
+    return derived_index("names").search(query, limit)
 
 # Query functions
 def get_parents(name: str) -> List[str]:
     """Get the parents of a character"""
-    if name not in family_tree:
-        return []
-    return family_tree[name].get("parents", [])
+    return tree.get_parents(name)
 
 def get_children(name: str) -> List[str]:
     """Get the children of a character"""
-    if name not in family_tree:
-        return []
-    return family_tree[name].get("children", [])
+    return tree.get_children(name)
 
 def get_siblings(name: str) -> List[str]:
     """Get siblings (same parents) of a character"""
-    parents = get_parents(name)
-    if not parents:
-        return []
-    
-    siblings = set()
-    for parent in parents:
-        children = get_children(parent)
-        siblings.update(children)
-    
-    # Remove the person themselves
-    siblings.discard(name)
-    return sorted(list(siblings))
+    return tree.get_siblings(name)
+
+def get_kinship() -> Kinship:
+    """Sibling groups for the current tree"""
+    return derived_index("kinship")
+
+def get_cousins(name: str, degree: int = 1, removed: int = 0) -> List[str]:
+    """Get n-th cousins, m times removed, of a character"""
+    return get_kinship().cousins(name, degree, removed)
+
+def get_coefficients() -> KinshipCoefficients:
+    """Memoised kinship/inbreeding coefficients for the current tree"""
+    return derived_index("coefficients")
 
 def get_ancestors(name: str, max_generations: Optional[int] = None) -> Dict[str, int]:
     """Get all ancestors with their generation distance"""
-    if name not in family_tree:
-        return {}
-    
-    results = {}
-    queue = deque([(name, 0)])
-    visited = {name}
-    
-    while queue:
-        current, dist = queue.popleft()
-        
-        if max_generations is not None and dist >= max_generations:
-            continue
-        
-        for parent in get_parents(current):
-            if parent not in visited:
-                visited.add(parent)
-                gen = dist + 1
-                results[parent] = gen
-                queue.append((parent, gen))
-    
-    return results
+    return tree.get_ancestors(name, max_generations)
 
 def get_descendants(name: str, max_generations: Optional[int] = None) -> Dict[str, int]:
     """Get all descendants with their generation distance"""
-    if name not in family_tree:
-        return {}
-    
-    results = {}
-    queue = deque([(name, 0)])
-    visited = {name}
-    
-    while queue:
-        current, dist = queue.popleft()
-        
-        if max_generations is not None and dist >= max_generations:
-            continue
-        
-        for child in get_children(current):
-            if child not in visited:
-                visited.add(child)
-                gen = dist + 1
-                results[child] = gen
-                queue.append((child, gen))
-    
-    return results
+    return tree.get_descendants(name, max_generations)
+
+def _levels(name: str, upward: bool, max_generations: Optional[int],
+            max_names: Optional[int] = None) -> Iterable[Tuple[int, List[str]]]:
+    """Ancestors/descendants grouped by generation, on the worker pool when there is one
+    (in-process the walk is lazy, so a consumer that stops early stops the walk; a pool
+    worker stops after the generation that goes past `max_names`)"""
+    if pool is not None:
+        try:
+            if upward:
+                return pool.ancestor_levels(name, max_generations, max_names)
+            return pool.descendant_levels(name, max_generations, max_names)
+        except TimeoutError:
+            raise gr.Error(f"Query for {name} took longer than {QUERY_TIMEOUT:g}s, try fewer generations")
+        except (BrokenExecutor, OSError, ValueError):
+            pass  # no usable snapshot or pool; answer in-process
+    if upward:
+        return tree.iter_ancestor_generations(name, max_generations)
+    return tree.iter_descendant_generations(name, max_generations)
 
 def find_common_ancestor(name1: str, name2: str) -> Optional[Tuple[str, int, int]]:
-    """Find the closest common ancestor of two people"""
-    ancestors1 = get_ancestors(name1)
-    ancestors2 = get_ancestors(name2)
-    
-    common = set(ancestors1.keys()) & set(ancestors2.keys())
-    if not common:
-        return None
-    
-    # Find the closest common ancestor (minimum total distance)
-    best = None
-    min_dist = float('inf')
-    
-    for ancestor in common:
-        total_dist = ancestors1[ancestor] + ancestors2[ancestor]
-        if total_dist < min_dist:
-            min_dist = total_dist
-            best = (ancestor, ancestors1[ancestor], ancestors2[ancestor])
-    
-    return best
+    """Find the closest common ancestor of two people (minimum total distance)"""
+    return tree.find_common_ancestor(name1, name2)
 
 def get_relationship(name1: str, name2: str) -> str:
     """Determine the relationship between two people"""
-    if name1 not in family_tree or name2 not in family_tree:
-        return "❌ One or both characters not found"
+    kind, *info = tree.relationship(name1, name2)
     
-    if name1 == name2:
+    if kind == "unknown":
+        return "❌ One or both characters not found"
+    if kind == "same":
         return "👤 Same person"
-    
-    # Check parent-child
-    if name2 in get_parents(name1):
+    if kind == "parent":
         return f"👨‍👦 {name2} is a parent of {name1}"
-    if name2 in get_children(name1):
+    if kind == "child":
         return f"👶 {name2} is a child of {name1}"
-    
-    # Check siblings
-    siblings1 = get_siblings(name1)
-    if name2 in siblings1:
+    if kind == "sibling":
         return f"👫 {name1} and {name2} are siblings"
     
-    # Check ancestors/descendants
-    ancestors1 = get_ancestors(name1)
-    descendants1 = get_descendants(name1)
-    
-    if name2 in ancestors1:
-        gen = ancestors1[name2]
+    if kind == "ancestor":
+        gen = info[0]
         if gen == 2:
             return f"👴 {name2} is a grandparent of {name1}"
         else:
             return f"🏛️ {name2} is an ancestor of {name1} ({gen} generations back)"
     
-    if name2 in descendants1:
-        gen = descendants1[name2]
+    if kind == "descendant":
+        gen = info[0]
         if gen == 2:
             return f"👶 {name2} is a grandchild of {name1}"
         else:
             return f"👨‍👩‍👧‍👦 {name2} is a descendant of {name1} ({gen} generations forward)"
     
-    # Check for common ancestor
-    common = find_common_ancestor(name1, name2)
-    if common:
-        ancestor, dist1, dist2 = common
+    if kind == "common_ancestor":
+        ancestor, dist1, dist2 = info
         return f"🔗 {name1} and {name2} share a common ancestor: {ancestor} ({dist1} gens from {name1}, {dist2} gens from {name2})"
     
     return f"❓ No direct family relationship found between {name1} and {name2}"
 
 # Gradio interface functions
+@cached_query("parents")
 def query_parents(name: str) -> str:
     """Query handler for parents"""
     parents = get_parents(name)
@@ -169,6 +235,7 @@ def query_parents(name: str) -> str:
         result += f"{i}. {parent}\n"
     return result
 
+@cached_query("children")
 def query_children(name: str) -> str:
     """Query handler for children"""
     children = get_children(name)
@@ -180,67 +247,103 @@ def query_children(name: str) -> str:
         result += f"{i}. {child}\n"
     return result
 
+@cached_query("siblings")
 def query_siblings(name: str) -> str:
     """Query handler for siblings"""
-    siblings = get_siblings(name)
-    if not siblings:
+    kin = get_kinship()
+    full, half = kin.full_siblings(name), kin.half_siblings(name)
+    if not full and not half:
         return f"❌ {name} has no recorded siblings in the database"
     
     result = f"👫 **Siblings of {name}:**\n\n"
-    for i, sibling in enumerate(siblings, 1):
+    for i, sibling in enumerate(full, 1):
         result += f"{i}. {sibling}\n"
+    if not full:
+        result += "No full siblings recorded\n"
+    if half:
+        result += f"\n**Half-siblings:**\n\n"
+        for i, sibling in enumerate(half, len(full) + 1):
+            result += f"{i}. {sibling}\n"
+    return result
+
+@cached_query("cousins")
+def query_cousins(name: str, degree: int = 1, removed: int = 0) -> str:
+    """Query handler for cousins"""
+    degree, removed = int(degree), int(removed)
+    label = cousin_label(degree, removed, plural=True)
+    cousins = get_cousins(name, degree, removed)
+    if not cousins:
+        return f"❌ {name} has no recorded {label} in the database"
+    
+    result = f"🧬 **{label[0].upper() + label[1:]} of {name}:**\n\n"
+    for i, cousin in enumerate(cousins, 1):
+        result += f"{i}. {cousin}\n"
     return result
 
+def _render_levels(kind: str, name: str, max_gen: int) -> Iterator[str]:
+    """Yield the Markdown answer so far after each generation, up to RESULT_MAX_NAMES names"""
+    levels = iter(_levels(name, kind == "ancestors", max_gen if max_gen > 0 else None, RESULT_MAX_NAMES))
+    first = next(levels, None)
+    if first is None:
+        yield f"❌ {name} has no recorded {kind} in the database"
+        return
+    
+    if kind == "ancestors":
+        parts = [f"🏛️ **Ancestors of {name}** (up to {max_gen} generations):\n\n"]
+    else:
+        parts = [f"👨‍👩‍👧‍👦 **Descendants of {name}** (up to {max_gen} generations):\n\n"]
+    room = RESULT_MAX_NAMES
+    
+    for gen, level in itertools.chain([first], levels):
+        parts.append(f"**Generation {gen}:**\n")
+        shown = sorted(level) if len(level) <= room else heapq.nsmallest(room, level)
+        parts.extend(f"  • {person}\n" for person in shown)
+        room -= len(shown)
+        if len(shown) < len(level):
+            parts.append(f"  • … and {len(level) - len(shown):,} more\n\n")
+            parts.append(f"⚠️ Showing the first {RESULT_MAX_NAMES:,} names. "
+                         f"Use the JSON API (`/api/{kind}?stream=1`) for the complete list.\n")
+            yield "".join(parts)
+            return
+        parts.append("\n")
+        yield "".join(parts)
+
+def _final(rendered: Iterator[str]) -> str:
+    result = ""
+    for result in rendered:
+        pass
+    return result
+
+@cached_query("ancestors")
 def query_ancestors(name: str, max_gen: int = 10) -> str:
     """Query handler for ancestors"""
-    ancestors = get_ancestors(name, max_generations=max_gen if max_gen > 0 else None)
-    if not ancestors:
-        return f"❌ {name} has no recorded ancestors in the database"
-    
-    result = f"🏛️ **Ancestors of {name}** (up to {max_gen} generations):\n\n"
-    
-    # Group by generation
-    by_gen = {}
-    for ancestor, gen in ancestors.items():
-        if gen not in by_gen:
-            by_gen[gen] = []
-        by_gen[gen].append(ancestor)
-    
-    for gen in sorted(by_gen.keys()):
-        result += f"**Generation {gen}:**\n"
-        for ancestor in sorted(by_gen[gen]):
-            result += f"  • {ancestor}\n"
-        result += "\n"
-    
-    return result
+    return _final(_render_levels("ancestors", name, max_gen))
 
+@cached_query("descendants")
 def query_descendants(name: str, max_gen: int = 10) -> str:
     """Query handler for descendants"""
-    descendants = get_descendants(name, max_generations=max_gen if max_gen > 0 else None)
-    if not descendants:
-        return f"❌ {name} has no recorded descendants in the database"
-    
-    result = f"👨‍👩‍👧‍👦 **Descendants of {name}** (up to {max_gen} generations):\n\n"
-    
-    # Group by generation
-    by_gen = {}
-    for descendant, gen in descendants.items():
-        if gen not in by_gen:
-            by_gen[gen] = []
-        by_gen[gen].append(descendant)
-    
-    for gen in sorted(by_gen.keys()):
-        result += f"**Generation {gen}:**\n"
-        for descendant in sorted(by_gen[gen]):
-            result += f"  • {descendant}\n"
-        result += "\n"
-    
-    return result
+    return _final(_render_levels("descendants", name, max_gen))
+
+def stream_levels(kind: str, name: str, max_gen: int = 10) -> Iterator[str]:
+    """Streaming query handler for ancestors/descendants: one update per generation"""
+    # Same cache key as query_ancestors/query_descendants
+    key = (kind, name, max_gen)
+    t = tree
+    cached = result_cache.get(t, key)
+    if cached is not None:
+        yield cached
+        return
+    result = ""
+    for result in _render_levels(kind, name, max_gen):
+        yield result
+    result_cache.put(t, key, result)
 
+@cached_query("relationship")
 def query_relationship(name1: str, name2: str) -> str:
     """Query handler for relationship between two people"""
     return f"**Relationship Analysis:**\n\n{get_relationship(name1, name2)}"
 
+@cached_query("common_ancestor")
 def query_common_ancestor(name1: str, name2: str) -> str:
     """Query handler for common ancestor"""
     common = find_common_ancestor(name1, name2)
@@ -256,6 +359,25 @@ def query_common_ancestor(name1: str, name2: str) -> str:
     
     return result
 
+@cached_query("kinship")
+def query_kinship(name1: str, name2: str) -> str:
+    """Query handler for kinship/inbreeding coefficients"""
+    coefficients = get_coefficients()
+    phi = coefficients.kinship(name1, name2)
+    if phi is None:
+        return "❌ One or both characters not found"
+    
+    result = f"🧬 **Kinship Coefficients:**\n\n"
+    result += f"• Kinship of {name1} and {name2}: {phi:.4f}\n"
+    result += f"• Coefficient of relationship: {coefficients.relatedness(name1, name2):.2%}\n"
+    result += f"• Inbreeding of {name1}: {coefficients.inbreeding(name1):.4f}\n"
+    if name2 != name1:
+        result += f"• Inbreeding of {name2}: {coefficients.inbreeding(name2):.4f}\n"
+    result += "\n_Kinship is the chance that a gene picked from each person is inherited from the same ancestor; "
+    result += "characters with no recorded parents are treated as unrelated founders._\n"
+    
+    return result
+
 # Create Gradio interface
 with gr.Blocks(theme=gr.themes.Soft(), title="Game of Thrones Family Tree") as demo:
     gr.Markdown("""
@@ -265,7 +387,11 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Game of Thrones Family Tree") as d
     Select a query type and character(s) to discover their lineage.
     """)
     
-    all_names = get_all_names()
+    # Only the best matches go to the browser; typing fetches new ones (see suggest_names)
+    all_names = search_names("")
+    first_name = all_names[0] if all_names else None
+    default1 = "Jon Snow" if "Jon Snow" in tree else first_name
+    default2 = "Daenerys Targaryen" if "Daenerys Targaryen" in tree else all_names[1] if len(all_names) > 1 else first_name
     
     with gr.Tabs():
         # Tab 1: Single Character Queries
@@ -275,12 +401,13 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Game of Thrones Family Tree") as d
                     char_select = gr.Dropdown(
                         choices=all_names,
                         label="Select Character",
-                        value=all_names[0] if all_names else None,
-                        filterable=True
+                        value=first_name,
+                        filterable=True,
+                        allow_custom_value=True
                     )
                     
                     query_type = gr.Radio(
-                        choices=["Parents", "Children", "Siblings", "Ancestors", "Descendants"],
+                        choices=["Parents", "Children", "Siblings", "Cousins", "Ancestors", "Descendants"],
                         label="Query Type",
                         value="Parents"
                     )
@@ -294,36 +421,46 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Game of Thrones Family Tree") as d
                         visible=False
                     )
                     
+                    with gr.Row(visible=False) as cousin_controls:
+                        cousin_degree = gr.Slider(minimum=1, maximum=5, value=1, step=1, label="Cousin Degree")
+                        cousin_removed = gr.Slider(minimum=0, maximum=3, value=0, step=1, label="Times Removed")
+                    
                     query_btn = gr.Button("🔍 Query", variant="primary", size="lg")
                 
                 with gr.Column(scale=2):
                     result_output = gr.Markdown(label="Results")
             
             def update_slider_visibility(query_type):
-                return gr.update(visible=query_type in ["Ancestors", "Descendants"])
+                return (gr.update(visible=query_type in ["Ancestors", "Descendants"]),
+                        gr.update(visible=query_type == "Cousins"))
             
             query_type.change(
                 fn=update_slider_visibility,
                 inputs=[query_type],
-                outputs=[max_gen]
+                outputs=[max_gen, cousin_controls]
             )
             
-            def execute_query(name, qtype, max_g):
+            def execute_query(name, qtype, max_g, degree, removed):
+                # A generator, so ancestors/descendants show up one generation at a time
                 if qtype == "Parents":
-                    return query_parents(name)
+                    yield query_parents(name)
                 elif qtype == "Children":
-                    return query_children(name)
+                    yield query_children(name)
                 elif qtype == "Siblings":
-                    return query_siblings(name)
+                    yield query_siblings(name)
+                elif qtype == "Cousins":
+                    yield query_cousins(name, degree, removed)
                 elif qtype == "Ancestors":
-                    return query_ancestors(name, max_g)
+                    yield from stream_levels("ancestors", name, max_g)
                 elif qtype == "Descendants":
-                    return query_descendants(name, max_g)
+                    yield from stream_levels("descendants", name, max_g)
             
             query_btn.click(
                 fn=execute_query,
-                inputs=[char_select, query_type, max_gen],
-                outputs=[result_output]
+                inputs=[char_select, query_type, max_gen, cousin_degree, cousin_removed],
+                outputs=[result_output],
+                concurrency_limit=TRAVERSAL_CONCURRENCY,
+                concurrency_id="traversal"
             )
         
         # Tab 2: Relationship Analysis
@@ -333,19 +470,21 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Game of Thrones Family Tree") as d
                     char1_select = gr.Dropdown(
                         choices=all_names,
                         label="First Character",
-                        value="Jon Snow" if "Jon Snow" in all_names else all_names[0],
-                        filterable=True
+                        value=default1,
+                        filterable=True,
+                        allow_custom_value=True
                     )
                     
                     char2_select = gr.Dropdown(
                         choices=all_names,
                         label="Second Character",
-                        value="Daenerys Targaryen" if "Daenerys Targaryen" in all_names else all_names[1] if len(all_names) > 1 else all_names[0],
-                        filterable=True
+                        value=default2,
+                        filterable=True,
+                        allow_custom_value=True
                     )
                     
                     rel_type = gr.Radio(
-                        choices=["General Relationship", "Common Ancestor"],
+                        choices=["General Relationship", "Common Ancestor", "Kinship Coefficient"],
                         label="Analysis Type",
                         value="General Relationship"
                     )
@@ -358,6 +497,8 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Game of Thrones Family Tree") as d
             def execute_relationship(name1, name2, rel_type):
                 if rel_type == "General Relationship":
                     return query_relationship(name1, name2)
+                elif rel_type == "Kinship Coefficient":
+                    return query_kinship(name1, name2)
                 else:
                     return query_common_ancestor(name1, name2)
             
@@ -372,7 +513,7 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Game of Thrones Family Tree") as d
             gr.Markdown(f"""
             ### 📈 Database Statistics
             
-            - **Total Characters:** {len(family_tree)}
+            - **Total Characters:** {len(tree)}
             - **Houses Represented:** Stark, Targaryen, Lannister, Baratheon, Tully, Martell, Tyrell, Greyjoy, Arryn, Frey
             
             ### 🏰 Major Houses
@@ -386,11 +527,13 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Game of Thrones Family Tree") as d
             
             1. **Parents** - Find the parents of any character
             2. **Children** - List all children of a character
-            3. **Siblings** - Find siblings (shared parents)
-            4. **Ancestors** - Trace lineage back multiple generations
-            5. **Descendants** - Find all descendants forward
-            6. **Relationship** - Analyze connection between two characters
-            7. **Common Ancestor** - Find shared ancestry
+            3. **Siblings** - Find full and half siblings (shared parents)
+            4. **Cousins** - Find n-th cousins, m times removed
+            5. **Ancestors** - Trace lineage back multiple generations
+            6. **Descendants** - Find all descendants forward
+            7. **Relationship** - Analyze connection between two characters
+            8. **Common Ancestor** - Find shared ancestry
+            9. **Kinship Coefficient** - Measure relatedness and inbreeding
             
             ### 🎯 Example Queries
             
@@ -401,5 +544,25 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Game of Thrones Family Tree") as d
             - Common ancestor of **Robb Stark** and **Jon Snow**
             """)
 
+    # Pick up characters added by a reload whenever the page is opened
+    def refresh_names():
+        names = search_names("")
+        return [gr.update(choices=names)] * 3
+    
+    demo.load(fn=refresh_names, outputs=[char_select, char1_select, char2_select])
+    
+    def suggest_names(key_up: gr.KeyUpData):
+        return gr.update(choices=search_names(key_up.input_value))
+    
+    for dropdown in (char_select, char1_select, char2_select):
+        dropdown.key_up(fn=suggest_names, outputs=[dropdown], queue=False, show_progress="hidden")
+
 if __name__ == "__main__":
+    threading.Thread(target=_warm_derived, name="warm-indexes", daemon=True).start()
+    reloader.start()
+    if TRAVERSAL_WORKERS > 0:
+        pool = TraversalPool(SNAPSHOT_PATH, TRAVERSAL_WORKERS, timeout=QUERY_TIMEOUT)
+    if API_PORT > 0:
+        serve_api(QueryAPI(lambda: tree, result_cache), "127.0.0.1", API_PORT)
+    demo.queue(max_size=QUEUE_MAX_SIZE, default_concurrency_limit=CONCURRENCY_LIMIT)
     demo.launch(share=False, server_name="127.0.0.1", server_port=7861)
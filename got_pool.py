@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from typing import List, Optional, Tuple
+
+from got import FamilyTree
+
+# Per-worker state: the mapped snapshot and the (mtime, size) it was opened at.
+_tree: Optional[FamilyTree] = None
+_opened: Optional[Tuple[int, int]] = None
+
+
+def _worker_tree(path: str) -> FamilyTree:
+    # Workers map the snapshot read-only, so every process shares the same
+    # page-cache copy; a rewritten snapshot (hot reload) is remapped here.
+    global _tree, _opened
+    st = os.stat(path)
+    sig = (st.st_mtime_ns, st.st_size)
+    if _tree is None or sig != _opened:
+        _tree = FamilyTree.open_snapshot(path)
+        _opened = sig
+    return _tree
+
+
+def _levels(path: str, name: str, upward: bool, max_generations: Optional[int],
+            max_names: Optional[int], deadline: Optional[float]) -> List[Tuple[int, List[str]]]:
+    # The walk stops after the generation that takes it past max_names, so only
+    # what the caller can show is built and sent back. A running future cannot
+    # be cancelled either, so it also checks the caller's deadline (wall clock,
+    # shared by every process) after each generation and gives up once nobody
+    # is waiting for it any more.
+    tree = _worker_tree(path)
+    if upward:
+        walk = tree.iter_ancestor_generations(name, max_generations)
+    else:
+        walk = tree.iter_descendant_generations(name, max_generations)
+    levels = []
+    found = 0
+    for level in walk:
+        if deadline is not None and time.time() > deadline:
+            raise TimeoutError(f"walk from {name} passed its deadline")
+        levels.append(level)
+        found += len(level[1])
+        if max_names is not None and found > max_names:
+            break
+    return levels
+
+
+class TraversalPool:
+    """Run expensive ancestor/descendant walks in worker processes.
+
+    Pure-Python traversals hold the GIL, so under load a few deep queries
+    stall every Gradio thread; worker processes let them run in parallel.
+    Each worker opens the snapshot at ``snapshot_path`` itself. Workers are
+    started from a fork server (spawned where there is none), never forked
+    from the serving process with its threads and locks.
+    """
+
+    def __init__(self, snapshot_path: str, workers: int, timeout: Optional[float] = None):
+        self.snapshot_path = os.path.abspath(snapshot_path)
+        self.timeout = timeout
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+    def ancestor_levels(self, name: str, max_generations: Optional[int] = None,
+                        max_names: Optional[int] = None) -> List[Tuple[int, List[str]]]:
+        """``iter_ancestor_generations`` on a worker, stopping after the generation
+        that goes past ``max_names``; raises TimeoutError past ``timeout``."""
+        return self._run(name, True, max_generations, max_names)
+
+    def descendant_levels(self, name: str, max_generations: Optional[int] = None,
+                          max_names: Optional[int] = None) -> List[Tuple[int, List[str]]]:
+        """``iter_descendant_generations`` on a worker, stopping after the generation
+        that goes past ``max_names``; raises TimeoutError past ``timeout``."""
+        return self._run(name, False, max_generations, max_names)
+
+    def _run(self, name: str, upward: bool, max_generations: Optional[int],
+             max_names: Optional[int]) -> List[Tuple[int, List[str]]]:
+        deadline = None if self.timeout is None else time.time() + self.timeout
+        future = self._executor.submit(_levels, self.snapshot_path, name, upward, max_generations, max_names, deadline)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,308 +1,97 @@
 import gradio as gr
 import networkx as nx
-import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
-import io
-from PIL import Image
+import functools
+import html
+import os
+import tempfile
+
+from decision_tree import NUMBER_TREE
 
 class NumberClassifier:
-    def __init__(self):
+    def __init__(self, tree=NUMBER_TREE):
+        self.tree = tree
         self.reset()
     
     def reset(self):
         """Reset the classification state"""
         self.current_step = 0
-        self.path = []
+        self.node = 0
+        self.path = [0]
         self.questions = []
         self.answers = []
         self.result = None
         
     def get_current_question(self):
-        """Get the current question based on the path taken"""
-        if self.current_step == 0:
-            return "Is your number 5?"
-        
-        # Step 1: Check if 5
-        if self.current_step == 1:
-            if self.answers[0]:  # Yes to "Is it 5?"
-                self.result = 5
-                return None
-            else:
-                return "Is your number even?"
-        
-        # Step 2: Check if even
-        if self.current_step == 2:
-            return "Is your number a prime number?"
-        
-        # Step 3: Prime check
-        if self.current_step == 3:
-            is_even = self.answers[1]
-            is_prime = self.answers[2]
-            
-            if is_even and is_prime:
-                self.result = 2
-                return None
-            elif is_even and not is_prime:
-                return "Is your number divisible by 3?"
-            elif not is_even and is_prime:
-                return "Is your number divisible by 3?"
-            else:  # odd and not prime (1, 9)
-                return "Is your number greater than 5?"
-        
-        # Step 4: Additional checks
-        if self.current_step == 4:
-            is_even = self.answers[1]
-            is_prime = self.answers[2]
-            last_answer = self.answers[3]
-            
-            if is_even and not is_prime:
-                # Asked about divisible by 3
-                if last_answer:
-                    self.result = 6
-                else:
-                    return "Is your number a perfect square?"
-            elif not is_even and is_prime:
-                # Asked about divisible by 3
-                if last_answer:
-                    self.result = 3
-                else:
-                    self.result = 7
-            else:  # odd and not prime
-                # Asked "Is your number greater than 5?"
-                if last_answer:  # Greater than 5 (could be 7 or 9)
-                    return "Is your number a perfect square?"
-                else:  # Less than 5 (could be 1 or 3)
-                    return "Is your number divisible by 3?"
+        """Get the question at the current node, or record the result at a leaf"""
+        if self.tree.is_leaf(self.node):
+            self.result = self.tree.result[self.node]
             return None
-        
-        # Step 5: Final determination
-        if self.current_step == 5:
-            is_even = self.answers[1]
-            is_prime = self.answers[2]
-            greater_than_5 = self.answers[3]
-            perfect_sq_or_div = self.answers[4]
-            
-            if is_even and not is_prime:
-                # Perfect square check for even numbers
-                if perfect_sq_or_div:
-                    self.result = 4
-                else:
-                    self.result = 8
-            else:  # odd and not prime
-                if greater_than_5:
-                    # Asked about perfect square
-                    if perfect_sq_or_div:
-                        self.result = 9
-                    else:
-                        self.result = 7
-                else:
-                    # Asked about divisible by 3
-                    if perfect_sq_or_div:
-                        self.result = 3
-                    else:
-                        self.result = 1
-            return None
-        
-        return None
+        return self.tree.question(self.node)
     
     def answer_question(self, answer):
         """Process an answer and move to next question"""
         self.answers.append(answer)
         self.current_step += 1
+        self.node = self.tree.child(self.node, answer)
+        self.path.append(self.node)
         return self.get_current_question()
 
 
-def create_decision_tree_graph(classifier):
-    """Create a visual decision tree showing the current path"""
+# The complete decision tree never changes, so its graph and layout are built once.
+# Node ids are "start" plus "n<i>" for node i of NUMBER_TREE.
+TREE_NODES = {"start": "Start\n(%d-%d)" % (NUMBER_TREE.numbers[0], NUMBER_TREE.numbers[-1])}
+TREE_EDGES = [("start", "n0", "")]
+RESULT_NODES = set()
+for i in range(len(NUMBER_TREE)):
+    if NUMBER_TREE.is_leaf(i):
+        TREE_NODES[f"n{i}"] = f"✓ {NUMBER_TREE.result[i]}"
+        RESULT_NODES.add(f"n{i}")
+    else:
+        TREE_NODES[f"n{i}"] = NUMBER_TREE.predicate(i).label
+        TREE_EDGES.append((f"n{i}", f"n{NUMBER_TREE.yes[i]}", "Yes"))
+        TREE_EDGES.append((f"n{i}", f"n{NUMBER_TREE.no[i]}", "No"))
+
+# Hierarchical layout: 1.6 units between leaves, 1 between levels, start on top
+TREE_POS = {f"n{i}": (1 + 1.6 * x, 10 - depth) for i, (x, depth) in NUMBER_TREE.layout().items()}
+TREE_POS["start"] = (TREE_POS["n0"][0], 11)
+TREE_XLIM = (0, max(x for x, _ in TREE_POS.values()) + 1)
+TREE_YLIM = (min(y for _, y in TREE_POS.values()) - 1, 12)
+
+TREE_GRAPH = nx.DiGraph()
+for node_id, label in TREE_NODES.items():
+    TREE_GRAPH.add_node(node_id, label=label)
+for src, dst, label in TREE_EDGES:
+    TREE_GRAPH.add_edge(src, dst, label=label)
+
+# "svg" sends the tree once and only a highlight stylesheet per answer; "png" sends a cached image.
+RENDER_MODE = os.environ.get("NUMBER_TREE_RENDER", "svg")
+
+# Rendered images, one file per answer prefix; there are only as many as tree nodes.
+IMAGE_DIR = os.environ.get("NUMBER_TREE_IMAGE_DIR") or tempfile.mkdtemp(prefix="number_tree_")
+
+
+def tree_path(answers):
+    """Edges taken and the node reached after the given answers"""
+    nodes = NUMBER_TREE.path(answers)
+    if not answers:
+        return [], "start"
+    ids = ["start"] + [f"n{i}" for i in nodes]
+    return list(zip(ids, ids[1:])), ids[-1]
+
+
+@functools.lru_cache(maxsize=None)
+def render_tree(answers):
+    """Render the tree with the path for ``answers`` (a tuple of bools) highlighted; returns a PNG path"""
+    path_edges, current_node = tree_path(answers)
+    G, pos = TREE_GRAPH, TREE_POS
+
     fig = Figure(figsize=(16, 11))
     ax = fig.add_subplot(111)
-    
-    # Create directed graph
-    G = nx.DiGraph()
-    
-    # Define the complete decision tree structure
-    nodes = {
-        "start": "Start\n(1-9)",
-        "q1": "Is it 5?",
-        "5": "✓ 5",
-        "q2": "Is it even?",
-        "q3_even": "Prime?",
-        "q3_odd": "Prime?",
-        "2": "✓ 2",
-        "q4_even": "Div by 3?",
-        "6": "✓ 6",
-        "q5_even": "Perfect\nSquare?",
-        "4": "✓ 4",
-        "8": "✓ 8",
-        "q4_odd_prime": "Div by 3?",
-        "3": "✓ 3",
-        "7": "✓ 7",
-        "q4_odd_not": "> 5?",
-        "q5_odd_gt5": "Perfect\nSquare?",
-        "q5_odd_lt5": "Div by 3?",
-        "9": "✓ 9",
-        "7_2": "✓ 7",
-        "3_2": "✓ 3",
-        "1": "✓ 1"
-    }
-    
-    # Add all nodes
-    for node_id, label in nodes.items():
-        G.add_node(node_id, label=label)
-    
-    # Define edges
-    edges = [
-        ("start", "q1", ""),
-        ("q1", "5", "Yes"),
-        ("q1", "q2", "No"),
-        ("q2", "q3_even", "Yes"),
-        ("q2", "q3_odd", "No"),
-        ("q3_even", "2", "Yes"),
-        ("q3_even", "q4_even", "No"),
-        ("q4_even", "6", "Yes"),
-        ("q4_even", "q5_even", "No"),
-        ("q5_even", "4", "Yes"),
-        ("q5_even", "8", "No"),
-        ("q3_odd", "q4_odd_prime", "Yes"),
-        ("q3_odd", "q4_odd_not", "No"),
-        ("q4_odd_prime", "3", "Yes"),
-        ("q4_odd_prime", "7", "No"),
-        ("q4_odd_not", "q5_odd_gt5", "Yes"),
-        ("q4_odd_not", "q5_odd_lt5", "No"),
-        ("q5_odd_gt5", "9", "Yes"),
-        ("q5_odd_gt5", "7_2", "No"),
-        ("q5_odd_lt5", "3_2", "Yes"),
-        ("q5_odd_lt5", "1", "No"),
-    ]
-    
-    for src, dst, label in edges:
-        G.add_edge(src, dst, label=label)
-    
-    # Create hierarchical layout
-    pos = {
-        "start": (8, 11),
-        "q1": (8, 10),
-        "5": (3, 9),
-        "q2": (11, 9),
-        "q3_even": (9, 8),
-        "q3_odd": (13, 8),
-        "2": (7, 7),
-        "q4_even": (10, 7),
-        "6": (9, 6),
-        "q5_even": (11, 6),
-        "4": (10, 5),
-        "8": (12, 5),
-        "q4_odd_prime": (12, 7),
-        "3": (11.5, 6.5),
-        "7": (12.5, 6.5),
-        "q4_odd_not": (14, 7),
-        "q5_odd_gt5": (13, 6),
-        "q5_odd_lt5": (15, 6),
-        "9": (12.5, 5),
-        "7_2": (13.5, 5),
-        "3_2": (14.5, 5),
-        "1": "15.5, 5",
-    }
-    
-    # Determine current path
-    current_path_edges = []
-    current_node = "start"
-    
-    if classifier.current_step > 0:
-        current_path_edges.append(("start", "q1"))
-        
-        if classifier.current_step >= 1 and len(classifier.answers) >= 1:
-            if classifier.answers[0]:
-                current_path_edges.append(("q1", "5"))
-                current_node = "5"
-            else:
-                current_path_edges.append(("q1", "q2"))
-                current_node = "q2"
-                
-                if classifier.current_step >= 2 and len(classifier.answers) >= 2:
-                    is_even = classifier.answers[1]
-                    if is_even:
-                        current_path_edges.append(("q2", "q3_even"))
-                        current_node = "q3_even"
-                    else:
-                        current_path_edges.append(("q2", "q3_odd"))
-                        current_node = "q3_odd"
-                    
-                    if classifier.current_step >= 3 and len(classifier.answers) >= 3:
-                        is_prime = classifier.answers[2]
-                        
-                        if is_even and is_prime:
-                            current_path_edges.append(("q3_even", "2"))
-                            current_node = "2"
-                        elif is_even and not is_prime:
-                            current_path_edges.append(("q3_even", "q4_even"))
-                            current_node = "q4_even"
-                            
-                            if classifier.current_step >= 4 and len(classifier.answers) >= 4:
-                                div_by_3 = classifier.answers[3]
-                                if div_by_3:
-                                    current_path_edges.append(("q4_even", "6"))
-                                    current_node = "6"
-                                else:
-                                    current_path_edges.append(("q4_even", "q5_even"))
-                                    current_node = "q5_even"
-                                    
-                                    if classifier.current_step >= 5 and len(classifier.answers) >= 5:
-                                        perfect_sq = classifier.answers[4]
-                                        if perfect_sq:
-                                            current_path_edges.append(("q5_even", "4"))
-                                            current_node = "4"
-                                        else:
-                                            current_path_edges.append(("q5_even", "8"))
-                                            current_node = "8"
-                        
-                        elif not is_even and is_prime:
-                            current_path_edges.append(("q3_odd", "q4_odd_prime"))
-                            current_node = "q4_odd_prime"
-                            
-                            if classifier.current_step >= 4 and len(classifier.answers) >= 4:
-                                div_by_3 = classifier.answers[3]
-                                if div_by_3:
-                                    current_path_edges.append(("q4_odd_prime", "3"))
-                                    current_node = "3"
-                                else:
-                                    current_path_edges.append(("q4_odd_prime", "7"))
-                                    current_node = "7"
-                        
-                        else:  # not even and not prime
-                            current_path_edges.append(("q3_odd", "q4_odd_not"))
-                            current_node = "q4_odd_not"
-                            
-                            if classifier.current_step >= 4 and len(classifier.answers) >= 4:
-                                greater_than_5 = classifier.answers[3]
-                                if greater_than_5:
-                                    current_path_edges.append(("q4_odd_not", "q5_odd_gt5"))
-                                    current_node = "q5_odd_gt5"
-                                    
-                                    if classifier.current_step >= 5 and len(classifier.answers) >= 5:
-                                        perfect_sq = classifier.answers[4]
-                                        if perfect_sq:
-                                            current_path_edges.append(("q5_odd_gt5", "9"))
-                                            current_node = "9"
-                                        else:
-                                            current_path_edges.append(("q5_odd_gt5", "7_2"))
-                                            current_node = "7_2"
-                                else:
-                                    current_path_edges.append(("q4_odd_not", "q5_odd_lt5"))
-                                    current_node = "q5_odd_lt5"
-                                    
-                                    if classifier.current_step >= 5 and len(classifier.answers) >= 5:
-                                        div_by_3 = classifier.answers[4]
-                                        if div_by_3:
-                                            current_path_edges.append(("q5_odd_lt5", "3_2"))
-                                            current_node = "3_2"
-                                        else:
-                                            current_path_edges.append(("q5_odd_lt5", "1"))
-                                            current_node = "1"
-    
+
     # Draw edges
-    for src, dst, label in edges:
-        if (src, dst) in current_path_edges:
+    for src, dst, label in TREE_EDGES:
+        if (src, dst) in path_edges:
             nx.draw_networkx_edges(G, pos, [(src, dst)], 
                                  edge_color='#00ff00', width=4, 
                                  arrowsize=20, ax=ax, arrows=True,
@@ -314,13 +103,11 @@ def create_decision_tree_graph(classifier):
                                  connectionstyle="arc3,rad=0.1", alpha=0.3)
     
     # Draw nodes
-    result_nodes = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "3_2", "7_2"]
-    
     for node in G.nodes():
         if node == current_node:
             color = '#ffff00'  # Yellow for current
             size = 3000
-        elif node in result_nodes:
+        elif node in RESULT_NODES:
             color = '#90EE90'  # Light green for results
             size = 2500
         elif node == "start":
@@ -334,38 +121,134 @@ def create_decision_tree_graph(classifier):
                              node_size=size, ax=ax, alpha=0.9)
     
     # Draw labels
-    labels = {node: nodes[node] for node in G.nodes()}
-    nx.draw_networkx_labels(G, pos, labels, font_size=9, 
+    nx.draw_networkx_labels(G, pos, TREE_NODES, font_size=9, 
                            font_weight='bold', ax=ax)
     
     # Draw edge labels
-    edge_labels = {(src, dst): label for src, dst, label in edges if label}
+    edge_labels = {(src, dst): label for src, dst, label in TREE_EDGES if label}
     nx.draw_networkx_edge_labels(G, pos, edge_labels, font_size=8, ax=ax)
     
     ax.set_title("Decision Tree - Number Classification (1-9)", 
                 fontsize=16, fontweight='bold', pad=20)
     ax.axis('off')
-    ax.set_xlim(0, 18)
-    ax.set_ylim(3, 12)
+    ax.set_xlim(*TREE_XLIM)
+    ax.set_ylim(*TREE_YLIM)
     
-    # Convert to image
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', dpi=100, bbox_inches='tight', 
+    # Written once per path; Gradio serves the file instead of re-encoding an image per click
+    path = os.path.join(IMAGE_DIR, "tree_" + "".join("y" if a else "n" for a in answers) + ".png")
+    fig.savefig(path, format='png', dpi=100, bbox_inches='tight', 
                 facecolor='white', edgecolor='none')
-    buf.seek(0)
-    img = Image.open(buf)
-    plt.close(fig)
-    
-    return img
+    return path
+
+
+def reachable_answers():
+    """Every answer prefix a game can pass through, from the start to each result"""
+    prefixes = [()]
+    for answers in prefixes:
+        if not NUMBER_TREE.is_leaf(NUMBER_TREE.path(answers)[-1]):
+            prefixes.extend([answers + (True,), answers + (False,)])
+    return prefixes
+
+
+def warm_tree_images():
+    """Render every reachable state up front so no player waits on matplotlib"""
+    for answers in reachable_answers():
+        render_tree(answers)
+
+
+SVG_SCALE = 80  # pixels per layout unit
+SVG_RADIUS = 24
+
+
+SVG_LEFT = min(x for x, _ in TREE_POS.values()) - 0.6
+SVG_TOP = max(y for _, y in TREE_POS.values()) + 0.6
 
 
-# Global classifier instance
-classifier = NumberClassifier()
+def _svg_xy(node):
+    x, y = TREE_POS[node]
+    return (x - SVG_LEFT) * SVG_SCALE, (SVG_TOP - y) * SVG_SCALE
+
+
+def build_tree_svg():
+    """The whole tree as inline SVG with every node and edge in its un-highlighted style"""
+    width = (max(x for x, _ in TREE_POS.values()) + 0.6 - SVG_LEFT) * SVG_SCALE
+    height = (SVG_TOP - min(y for _, y in TREE_POS.values()) + 0.6) * SVG_SCALE
+    parts = [
+        f'<svg id="nt-tree" viewBox="0 -40 {width:.0f} {height + 40:.0f}" width="100%" '
+        'xmlns="http://www.w3.org/2000/svg" font-family="sans-serif" font-weight="bold">',
+        '<style>'
+        '#nt-tree .nt-edge path{stroke:#666666;stroke-opacity:0.3;stroke-width:1.5;fill:none;'
+        'marker-end:url(#nt-arrow)}'
+        '#nt-tree .nt-edge text{font-size:11px;fill:#333333}'
+        '#nt-tree .nt-node circle{fill:#FFB6C1;fill-opacity:0.9}'
+        '#nt-tree .nt-result circle{fill:#90EE90}'
+        '#nt-tree #nt-n-start circle{fill:#87CEEB}'
+        '#nt-tree .nt-node text{font-size:10px;text-anchor:middle;dominant-baseline:central}'
+        '</style>',
+        '<defs>'
+        '<marker id="nt-arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="6" markerHeight="6" '
+        'orient="auto"><path d="M0,0L10,5L0,10z" fill="#666666" fill-opacity="0.5"/></marker>'
+        '<marker id="nt-arrow-on" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="4" markerHeight="4" '
+        'orient="auto"><path d="M0,0L10,5L0,10z" fill="#00ff00"/></marker>'
+        '</defs>',
+        f'<text x="{width / 2:.0f}" y="-10" font-size="20" text-anchor="middle">'
+        'Decision Tree - Number Classification (1-9)</text>',
+    ]
+    for src, dst, label in TREE_EDGES:
+        (x1, y1), (x2, y2) = _svg_xy(src), _svg_xy(dst)
+        dx, dy = x2 - x1, y2 - y1
+        length = (dx * dx + dy * dy) ** 0.5
+        ux, uy = dx / length, dy / length
+        x1, y1 = x1 + ux * SVG_RADIUS, y1 + uy * SVG_RADIUS
+        x2, y2 = x2 - ux * SVG_RADIUS, y2 - uy * SVG_RADIUS
+        parts.append(f'<g class="nt-edge" id="nt-e-{src}-{dst}">'
+                     f'<path d="M{x1:.1f},{y1:.1f}L{x2:.1f},{y2:.1f}"/>')
+        if label:
+            parts.append(f'<text x="{(x1 + x2) / 2 + 4:.1f}" y="{(y1 + y2) / 2 - 4:.1f}">{label}</text>')
+        parts.append('</g>')
+    for node, label in TREE_NODES.items():
+        x, y = _svg_xy(node)
+        kind = "nt-node nt-result" if node in RESULT_NODES else "nt-node"
+        lines = label.split("\n")
+        tspans = "".join(f'<tspan x="{x:.1f}" dy="{(1 - len(lines)) * 0.6 if i == 0 else 1.2}em">'
+                         f'{html.escape(line)}</tspan>' for i, line in enumerate(lines))
+        parts.append(f'<g class="{kind}" id="nt-n-{node}"><circle cx="{x:.1f}" cy="{y:.1f}" r="{SVG_RADIUS}"/>'
+                     f'<text x="{x:.1f}" y="{y:.1f}">{tspans}</text></g>')
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+TREE_SVG = build_tree_svg()
+
+
+@functools.lru_cache(maxsize=None)
+def tree_highlight_css(answers):
+    """A few hundred bytes of CSS that highlight the path for ``answers`` on TREE_SVG"""
+    path_edges, current_node = tree_path(answers)
+    rules = []
+    if path_edges:
+        edges = ",".join(f"#nt-tree #nt-e-{src}-{dst} path" for src, dst in path_edges)
+        rules.append(f"{edges}{{stroke:#00ff00;stroke-opacity:1;stroke-width:4;marker-end:url(#nt-arrow-on)}}")
+    rules.append(f"#nt-tree #nt-n-{current_node} circle{{fill:#ffff00;r:{SVG_RADIUS + 4}px}}")
+    return f"<style>{''.join(rules)}</style>"
+
+
+def create_decision_tree_graph(classifier):
+    """Create a visual decision tree showing the current path"""
+    answers = tuple(classifier.answers)
+    if RENDER_MODE == "svg":
+        return tree_highlight_css(answers)
+    return render_tree(answers)
+
+
+# Handlers are cheap, so many sessions can be answered at once
+CONCURRENCY_LIMIT = int(os.environ.get("NUMBER_GAME_CONCURRENCY", "64"))
+QUEUE_MAX_SIZE = int(os.environ.get("NUMBER_GAME_QUEUE", "1024"))
 
 
 def start_game():
-    """Start a new game"""
-    classifier.reset()
+    """Start a new game in this session"""
+    classifier = NumberClassifier()
     question = classifier.get_current_question()
     tree_img = create_decision_tree_graph(classifier)
     
@@ -376,21 +259,22 @@ def start_game():
         gr.update(visible=True, interactive=True),
         gr.update(visible=False),
         "Game started! Answer the questions to find your number.",
-        ""
+        "",
+        classifier
     )
 
 
-def answer_yes():
+def answer_yes(classifier):
     """Handle Yes answer"""
-    return process_answer(True)
+    return process_answer(classifier, True)
 
 
-def answer_no():
+def answer_no(classifier):
     """Handle No answer"""
-    return process_answer(False)
+    return process_answer(classifier, False)
 
 
-def process_answer(answer):
+def process_answer(classifier, answer):
     """Process the user's answer"""
     current_question = classifier.questions[-1] if classifier.questions else classifier.get_current_question()
     
@@ -420,7 +304,8 @@ def process_answer(answer):
             gr.update(visible=False),
             gr.update(visible=True),
             f"Classification complete! Your number is {classifier.result}.",
-            history
+            history,
+            classifier
         )
     else:
         # Continue game
@@ -431,7 +316,8 @@ def process_answer(answer):
             gr.update(visible=True, interactive=True),
             gr.update(visible=False),
             "Keep answering...",
-            history
+            history,
+            classifier
         )
 
 
@@ -443,10 +329,18 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Number Classifier") as demo:
     Watch the decision tree highlight your path in real-time.
     """)
     
+    # Each browser session plays its own game
+    game_state = gr.State(NumberClassifier)
+    
     with gr.Row():
         with gr.Column(scale=2):
-            tree_output = gr.Image(label="Decision Tree Visualization", 
-                                  type="pil", height=650)
+            if RENDER_MODE == "svg":
+                # Sent once with the page; answers only replace the stylesheet below
+                gr.HTML(TREE_SVG, label="Decision Tree Visualization")
+                tree_output = gr.HTML(tree_highlight_css(()))
+            else:
+                tree_output = gr.Image(label="Decision Tree Visualization", 
+                                      type="filepath", height=650)
         
         with gr.Column(scale=1):
             gr.Markdown("### 🎮 Game Controls")
@@ -485,21 +379,26 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Number Classifier") as demo:
     start_btn.click(
         fn=start_game,
         outputs=[tree_output, question_display, yes_btn, no_btn, 
-                start_btn, status_display, history_display]
+                start_btn, status_display, history_display, game_state]
     )
     
     yes_btn.click(
         fn=answer_yes,
+        inputs=game_state,
         outputs=[tree_output, question_display, yes_btn, no_btn, 
-                start_btn, status_display, history_display]
+                start_btn, status_display, history_display, game_state]
     )
     
     no_btn.click(
         fn=answer_no,
+        inputs=game_state,
         outputs=[tree_output, question_display, yes_btn, no_btn, 
-                start_btn, status_display, history_display]
+                start_btn, status_display, history_display, game_state]
     )
 
 
 if __name__ == "__main__":
+    if RENDER_MODE != "svg":
+        warm_tree_images()
+    demo.queue(max_size=QUEUE_MAX_SIZE, default_concurrency_limit=CONCURRENCY_LIMIT)
     demo.launch(share=False, server_name="127.0.0.1", server_port=7860)
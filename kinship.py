@@ -0,0 +1,240 @@
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from got import FamilyTree
+
+_ORDINALS = {1: "first", 2: "second", 3: "third", 4: "fourth", 5: "fifth"}
+_REMOVED = {1: "once", 2: "twice", 3: "three times"}
+
+
+def cousin_label(degree: int, removed: int, plural: bool = False) -> str:
+    """``(2, 1)`` -> ``"second cousin once removed"``."""
+    label = f"{_ORDINALS.get(degree, f'{degree}th')} cousin{'s' if plural else ''}"
+    if removed:
+        label += f" {_REMOVED.get(removed, f'{removed} times')} removed"
+    return label
+
+
+class Kinship:
+    """Sibling and cousin queries over one FamilyTree.
+
+    Children are grouped by their exact set of parents once, up front: full
+    siblings are the rest of a person's group, half siblings are the other
+    groups under any of their parents, so neither needs to rescan children.
+    Build a new Kinship after the tree changes (``version`` records which
+    state this one describes).
+    """
+
+    def __init__(self, tree: FamilyTree):
+        self.tree = tree
+        self.version = tree.version
+        self._group_of: Dict[str, int] = {}
+        self._groups: List[List[str]] = []
+        self._parent_sets: List[FrozenSet[str]] = []
+        self._groups_by_parent: Dict[str, List[int]] = {}
+        by_parents: Dict[FrozenSet[str], int] = {}
+        for name in tree:
+            parents = frozenset(tree.get_parents(name))
+            if not parents:
+                continue
+            g = by_parents.get(parents)
+            if g is None:
+                g = by_parents[parents] = len(self._groups)
+                self._groups.append([])
+                self._parent_sets.append(parents)
+                for p in parents:
+                    self._groups_by_parent.setdefault(p, []).append(g)
+            self._groups[g].append(name)
+            self._group_of[name] = g
+
+    def full_siblings(self, name: str) -> List[str]:
+        """Siblings sharing exactly the same recorded parents."""
+        g = self._group_of.get(name)
+        if g is None:
+            return []
+        return sorted(s for s in self._groups[g] if s != name)
+
+    def half_siblings(self, name: str) -> List[str]:
+        """Siblings sharing some, but not all, recorded parents."""
+        g = self._group_of.get(name)
+        if g is None:
+            return []
+        others: Set[int] = set()
+        for p in self._parent_sets[g]:
+            others.update(self._groups_by_parent[p])
+        others.discard(g)
+        return sorted(s for o in others for s in self._groups[o])
+
+    def siblings(self, name: str) -> List[str]:
+        return sorted(self.full_siblings(name) + self.half_siblings(name))
+
+    def cousin_degree(self, name1: str, name2: str) -> Optional[Tuple[int, int]]:
+        """``(degree, removed)`` if the two are cousins through their closest common ancestor."""
+        if name1 == name2 or name1 not in self.tree or name2 not in self.tree:
+            return None
+        return _cousin_degree(name1, name2, self.tree.get_ancestors(name1), self.tree.get_ancestors(name2))
+
+    def cousins(self, name: str, degree: int = 1, removed: int = 0) -> List[str]:
+        """Everyone who is ``name``'s ``degree``-th cousin ``removed`` times removed."""
+        if degree < 1 or removed < 0 or name not in self.tree:
+            return []
+        tree = self.tree
+        near, far = degree + 1, degree + 1 + removed
+        # A common ancestor at least as close as the one that makes them cousins
+        # is fewer than near + far generations from either side, so ancestor
+        # sets cut off there are enough to find the closest one.
+        depth = near + far - 1
+        ancestors = tree.get_ancestors(name, depth)
+        candidates: Set[str] = set()
+        # Up `near` then down `far` reaches cousins a generation-gap below;
+        # up `far` then down `near` reaches the ones above.
+        for up, down in {(near, far), (far, near)}:
+            for anc, gen in ancestors.items():
+                if gen == up:
+                    for g, level in tree.iter_descendant_generations(anc, down):
+                        if g == down:
+                            candidates.update(level)
+        candidates.discard(name)
+        found = []
+        for c in sorted(candidates):
+            if _cousin_degree(name, c, ancestors, tree.get_ancestors(c, depth)) == (degree, removed) \
+                    and not tree.is_ancestor(c, name) and not tree.is_ancestor(name, c):
+                found.append(c)
+        return found
+
+
+def _cousin_degree(name1: str, name2: str, anc1: Dict[str, int], anc2: Dict[str, int]) -> Optional[Tuple[int, int]]:
+    # Closest common ancestor by total distance, ties going to the most even split.
+    if name2 in anc1 or name1 in anc2:
+        return None
+    best: Optional[Tuple[int, int, int, int]] = None
+    for x, d1 in anc1.items():
+        d2 = anc2.get(x)
+        if d2 is not None:
+            key = (d1 + d2, -min(d1, d2), d1, d2)
+            if best is None or key < best:
+                best = key
+    if best is None:
+        return None
+    d1, d2 = best[2], best[3]
+    if min(d1, d2) < 2:
+        return None  # siblings, aunt/uncle and niece/nephew
+    return min(d1, d2) - 1, abs(d1 - d2)
+
+
+class KinshipCoefficients:
+    """Coefficients of kinship, relationship and inbreeding over one FamilyTree.
+
+    Works on integer ids with the additive relationship matrix factored as
+    ``A = T D T'`` (``phi = A / 2``): row ``T[a]`` holds each ancestor's
+    expected share of ``a``'s genes (half per generation, summed over paths),
+    and ``D[j]`` is the Mendelian sampling variance of ``j``,
+
+        D = 1 for founders,  3/4 - F(p)/4 for one recorded parent,
+        D = 1/2 - (F(f) + F(m))/4 for two,  F(j) = phi(f, m).
+
+    So ``phi(a, b)`` only sums over the ancestors ``a`` and ``b`` actually
+    share (0 at once when they share nobody), in time linear in their two
+    pedigrees. The one thing remembered between queries is ``D`` and ``F``
+    per shared ancestor reached: at most two floats per person, however many
+    pairs are asked about. Unrecorded parents are treated as unrelated
+    founders, and everything runs in loops, so deep pedigrees cannot
+    overflow Python's call stack.
+    """
+
+    def __init__(self, tree: FamilyTree):
+        self.tree = tree
+        self.version = tree.version
+        self._variance: Dict[int, float] = {}
+        self._inbreeding: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._variance)
+
+    def _gene_shares(self, i: int) -> Dict[int, float]:
+        # T[i]: walk i's ancestors latest-born first, so every child hands its
+        # share on to its parents before they pass theirs further up.
+        tree = self.tree
+        parent_ids = tree.parent_ids
+        parents_of = {i: parent_ids(i)}
+        stack = [i]
+        while stack:
+            for p in parents_of[stack.pop()]:
+                if p not in parents_of:
+                    parents_of[p] = parent_ids(p)
+                    stack.append(p)
+        shares = dict.fromkeys(parents_of, 0.0)
+        shares[i] = 1.0
+        for c in sorted(parents_of, key=tree.generation_of, reverse=True):
+            parents = parents_of[c]
+            if parents:
+                w = shares[c] / max(2, len(parents))
+                for p in parents:
+                    shares[p] += w
+        return shares
+
+    def _additive(self, a: int, b: int) -> float:
+        # A[a, b] = sum of T[a, j] * T[b, j] * D[j] over the ancestors they share
+        if a == b:
+            self._fill([a])
+            return 1 + self._inbreeding[a]
+        ta, tb = self._gene_shares(a), self._gene_shares(b)
+        if len(ta) > len(tb):
+            ta, tb = tb, ta
+        shared = [j for j in ta if j in tb]
+        if not shared:
+            return 0.0
+        self._fill(shared)
+        variance = self._variance
+        return sum(ta[j] * tb[j] * variance[j] for j in shared)
+
+    def _fill(self, people: List[int]):
+        # D and F for `people` and, through their parents, all their ancestors,
+        # earliest generation first so each one's inputs are already known.
+        tree, variance, inbreeding = self.tree, self._variance, self._inbreeding
+        todo = set()
+        stack = [i for i in people if i not in variance]
+        while stack:
+            i = stack.pop()
+            if i not in todo:
+                todo.add(i)
+                stack.extend(p for p in tree.parent_ids(i) if p not in variance)
+        # Full siblings share their parents' A, so it is worked out once per couple.
+        couples: Dict[Tuple[int, ...], float] = {}
+        for j in sorted(todo, key=tree.generation_of):
+            parents = tree.parent_ids(j)
+            k = len(parents)
+            if not k:
+                variance[j], inbreeding[j] = 1.0, 0.0
+                continue
+            couple = tuple(parents)
+            cross = couples.get(couple)
+            if cross is None:
+                cross = couples[couple] = sum(self._additive(parents[x], parents[y])
+                                              for x in range(k) for y in range(x + 1, k))
+            f = cross / 2 if k == 2 else 0.0
+            w = 1 / max(2, k)
+            inbreeding[j] = f
+            variance[j] = 1 + f - w * w * (sum(1 + inbreeding[p] for p in parents) + 2 * cross)
+
+    def kinship(self, name1: str, name2: str) -> Optional[float]:
+        """Probability that alleles drawn at random from each person are identical by descent."""
+        a, b = self.tree.person_id(name1), self.tree.person_id(name2)
+        if a is None or b is None:
+            return None
+        return self._additive(a, b) / 2
+
+    def inbreeding(self, name: str) -> Optional[float]:
+        """F: the kinship coefficient of the person's two parents (0 unless both are recorded)."""
+        i = self.tree.person_id(name)
+        if i is None:
+            return None
+        self._fill([i])
+        return self._inbreeding[i]
+
+    def relatedness(self, name1: str, name2: str) -> Optional[float]:
+        """Wright's coefficient of relationship, corrected for each person's inbreeding."""
+        phi = self.kinship(name1, name2)
+        if phi is None:
+            return None
+        f1, f2 = self.inbreeding(name1), self.inbreeding(name2)
+        return 2 * phi / ((1 + f1) * (1 + f2)) ** 0.5
@@ -0,0 +1,87 @@
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from heapq import nsmallest
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def _grams(key: str) -> Set[str]:
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Type-ahead search over a fixed set of names.
+
+    Matches are ranked: names starting with the query, then names with a later
+    word starting with it ("snow" finds "Jon Snow"), then, for typos, names
+    sharing enough trigrams with it. Prefix lookups are a bisect into sorted
+    case-folded keys; the trigram postings are built on first use, or ahead
+    of time by ``warm()`` (several seconds for a million names).
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self._names = sorted(names, key=str.casefold)
+        self._keys = [n.casefold() for n in self._names]
+        words = sorted((w, i) for i, key in enumerate(self._keys) for w in key.split()[1:])
+        self._words = [w for w, _ in words]
+        self._word_ids = array("i", [i for _, i in words])
+        self._postings: Optional[Dict[str, array]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _trigram_postings(self) -> Dict[str, array]:
+        with self._lock:
+            if self._postings is None:
+                postings: Dict[str, array] = {}
+                for i, key in enumerate(self._keys):
+                    for g in _grams(key):
+                        ids = postings.get(g)
+                        if ids is None:
+                            postings[g] = ids = array("i")
+                        ids.append(i)
+                self._postings = postings
+        return self._postings
+
+    def warm(self):
+        """Build the trigram postings now rather than on the first fuzzy search."""
+        self._trigram_postings()
+
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        q = " ".join(query.casefold().split())
+        if not q:
+            return self._names[:limit]
+        found: List[int] = []
+        seen: Set[int] = set()
+
+        def take(i: int) -> bool:
+            if i not in seen:
+                seen.add(i)
+                found.append(i)
+            return len(found) >= limit
+
+        keys = self._keys
+        for i in range(bisect_left(keys, q), len(keys)):
+            if not keys[i].startswith(q) or take(i):
+                break
+        if len(found) < limit:
+            words = self._words
+            for j in range(bisect_left(words, q), len(words)):
+                if not words[j].startswith(q) or take(self._word_ids[j]):
+                    break
+        if len(found) < limit:
+            grams = _grams(q)
+            shared = Counter()
+            postings = self._trigram_postings()
+            for g in grams:
+                ids = postings.get(g)
+                if ids is not None:
+                    shared.update(ids)
+            need = max(1, (len(grams) + 2) // 3)
+            ranked = nsmallest(limit - len(found), ((-n, i) for i, n in shared.items() if n >= need and i not in seen))
+            found.extend(i for _, i in ranked)
+        names = self._names
+        return [names[i] for i in found]
@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+from got import FamilyTree
+
+
+class QueryCache:
+    """Bounded LRU cache of rendered query results for one FamilyTree.
+
+    Entries are evicted least-recently-used first once either ``max_entries``
+    or ``max_bytes`` (summed ``sizeof`` of the cached values) is exceeded.
+    The whole cache is dropped as soon as it is asked about a different tree
+    object, or the same tree after a mutation (``FamilyTree.version``).
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 4 << 20,
+                 sizeof: Callable[[object], int] = lambda value: len(value)):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._tree: Optional[FamilyTree] = None
+        self._version = -1
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_tree(self, tree: FamilyTree):
+        if tree is not self._tree or tree.version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._tree = tree
+            self._version = tree.version
+
+    def get(self, tree: FamilyTree, key: Hashable, default=None):
+        with self._lock:
+            self._check_tree(tree)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, tree: FamilyTree, key: Hashable, value):
+        """Store ``value`` computed from ``tree``; dropped if the tree has changed since."""
+        size = self._sizeof(value)
+        with self._lock:
+            if tree is not self._tree or tree.version != self._version or size > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, tree: FamilyTree, key: Hashable, compute: Callable[[], object]):
+        missing = object()
+        value = self.get(tree, key, missing)
+        if value is missing:
+            # Computed outside the lock so slow queries don't serialise fast ones.
+            value = compute()
+            self.put(tree, key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions,
+                    "invalidations": self.invalidations}
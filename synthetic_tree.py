@@ -0,0 +1,145 @@
+"""Seeded synthetic genealogies for exercising FamilyTree at scale.
+
+    python synthetic_tree.py 1000000 --out big.jsonl
+
+Each generation is paired off into couples (or lone recorded parents), and
+every couple has a random number of children averaging ``branching``. With
+probability ``collapse`` a couple is formed from two siblings instead of two
+random people, so ancestries fold back onto themselves the way the
+Targaryens' do.
+"""
+
+import argparse
+import math
+import random
+from array import array
+from typing import Iterator, List, Sequence, Tuple
+
+from got import FamilyTree
+
+
+class ParentLists(Sequence):
+    """``parents[i]`` as slices of two flat arrays, so 10^7 people do not need 10^7 tuples."""
+
+    def __init__(self, offsets: array, flat: array):
+        self._off = offsets
+        self._flat = flat
+
+    def __len__(self) -> int:
+        return len(self._off) - 1
+
+    def __getitem__(self, i: int) -> array:
+        return self._flat[self._off[i]:self._off[i + 1]]
+
+    def __iter__(self) -> Iterator[array]:
+        off, flat = self._off, self._flat
+        for i in range(len(off) - 1):
+            yield flat[off[i]:off[i + 1]]
+
+
+def _children(rng: random.Random, mean: float) -> int:
+    # Poisson by inversion; fine for the small means used here.
+    k, p = 0, math.exp(-mean)
+    cumulative, u = p, rng.random()
+    while u > cumulative:
+        k += 1
+        p *= mean / k
+        cumulative += p
+    return k
+
+
+def synthetic_adjacency(people: int, depth: int = 20, branching: float = 2.4, collapse: float = 0.02,
+                        single_parent: float = 0.05, seed: int = 0) -> Tuple[List[str], ParentLists]:
+    """Names and parent index lists for about ``depth`` generations totalling ``people``.
+
+    The founder count is chosen so that ``depth`` generations growing by
+    ``branching / 2`` per generation add up to ``people``; generations keep
+    coming past ``depth`` if the random population falls short, and the last
+    one is cut off at exactly ``people``.
+    """
+    rng = random.Random(seed)
+    growth = max(branching / 2, 1.0001)
+    founders = max(2, min(people, round(people * (growth - 1) / (growth ** depth - 1))))
+    off = array("i", [0] * (founders + 1))
+    flat = array("i")
+    generation = list(range(founders))
+    # Which couple each person of the current generation was born to, for pairing siblings.
+    family_of = {i: i for i in generation}
+    families = founders
+    total = founders
+    while total < people:
+        rng.shuffle(generation)
+        by_family = {}
+        for person in generation:
+            by_family.setdefault(family_of[person], []).append(person)
+        taken = set()
+        couples = []
+        waiting = []
+        for person in generation:
+            if person in taken:
+                continue
+            taken.add(person)
+            if rng.random() < collapse:
+                sibling = next((s for s in by_family[family_of[person]] if s not in taken), None)
+                if sibling is not None:
+                    taken.add(sibling)
+                    couples.append((person, sibling))
+                    continue
+            waiting.append(person)
+        i = 0
+        while i < len(waiting):
+            if i + 1 == len(waiting) or rng.random() < single_parent:
+                couples.append((waiting[i],))
+                i += 1
+            else:
+                couples.append((waiting[i], waiting[i + 1]))
+                i += 2
+        family_of = {}
+        next_generation = []
+        for parents in couples:
+            for _ in range(_children(rng, branching)):
+                if total >= people:
+                    break
+                flat.extend(parents)
+                off.append(len(flat))
+                next_generation.append(total)
+                family_of[total] = families
+                total += 1
+            families += 1
+        if not next_generation:
+            # The line died out; carry on from fresh founders.
+            next_generation = list(range(total, min(people, total + founders)))
+            for person in next_generation:
+                off.append(len(flat))
+                family_of[person] = families
+                families += 1
+            total += len(next_generation)
+        generation = next_generation
+    names = [f"P{i}" for i in range(total)]
+    return names, ParentLists(off, flat)
+
+
+def synthetic_tree(people: int, depth: int = 20, branching: float = 2.4, collapse: float = 0.02,
+                   single_parent: float = 0.05, seed: int = 0, reachability_index: bool = False) -> FamilyTree:
+    names, parents = synthetic_adjacency(people, depth, branching, collapse, single_parent, seed)
+    return FamilyTree.from_adjacency(names, parents, reachability_index=reachability_index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("people", type=int)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--branching", type=float, default=2.4, help="mean children per couple")
+    parser.add_argument("--collapse", type=float, default=0.02, help="chance a couple are siblings")
+    parser.add_argument("--single-parent", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help=".json, .jsonl or .snap")
+    args = parser.parse_args()
+    tree = synthetic_tree(args.people, args.depth, args.branching, args.collapse, args.single_parent, args.seed)
+    if args.out.endswith(".snap"):
+        tree.save_snapshot(args.out)
+    elif args.out.endswith(".jsonl"):
+        tree.save_jsonl(args.out)
+    else:
+        tree.save_json(args.out)
+    print(f"{len(tree)} people, {max(map(tree.get_generation, tree), default=0) + 1} generations -> {args.out}")
@@ -0,0 +1,83 @@
+"""Tests for decision_tree.build_tree: every number is identified, in the fewest questions on average."""
+
+from typing import List
+
+import pytest
+
+from decision_tree import NUMBER_TREE, _optimal_splits, build_tree
+
+RANGES = [(1, 1), (-1, 0), (-1, 1), (1, 9), (0, 2), (-7, 5), (-20, -3), (-50, 50), (3, 102), (-1000, -1)]
+
+
+def _min_total_depths(limit: int) -> List[int]:
+    # Brute force over every root split: best[n] is the least sum of leaf depths
+    # over all binary trees with n leaves.
+    best = [0, 0]
+    for n in range(2, limit + 1):
+        best.append(n + min(best[a] + best[n - a] for a in range(1, n // 2 + 1)))
+    return best
+
+
+MIN_TOTAL_DEPTH = _min_total_depths(1000)
+
+
+def min_total_depth(n: int) -> int:
+    return MIN_TOTAL_DEPTH[n]
+
+
+def check_tree(lo: int, hi: int):
+    tree = build_tree(lo, hi)
+    numbers = list(range(lo, hi + 1))
+    assert tree.numbers == numbers
+    assert len(tree) == 2 * len(numbers) - 1
+    for n in numbers:
+        assert tree.classify(n) == n
+        path = tree.path(tree.answers_for(n))
+        assert tree.is_leaf(path[-1]) and tree.result[path[-1]] == n
+        assert len(path) - 1 == tree.depth[path[-1]]
+    assert tree.classify_many(numbers) == numbers
+    return tree
+
+
+@pytest.mark.parametrize("lo, hi", RANGES)
+def test_every_number_classifies_to_itself(lo, hi):
+    check_tree(lo, hi)
+
+
+@pytest.mark.parametrize("lo, hi", RANGES)
+def test_expected_depth_is_optimal(lo, hi):
+    tree = check_tree(lo, hi)
+    size = hi - lo + 1
+    assert tree.expected_questions() * size == pytest.approx(min_total_depth(size))
+
+
+@pytest.mark.parametrize("size", range(1, 41))
+def test_sizes_and_offsets(size):
+    for lo in (-size // 2, 1, -3 * size):
+        tree = check_tree(lo, lo + size - 1)
+        assert tree.expected_questions() * size == pytest.approx(min_total_depth(size))
+
+
+@pytest.mark.parametrize("n", range(2, 130))
+def test_optimal_splits_are_exactly_the_optimal_ones(n):
+    low, high = _optimal_splits(n)
+    optimal = [a for a in range(1, n) if n + min_total_depth(a) + min_total_depth(n - a) == min_total_depth(n)]
+    assert optimal == list(range(low, high + 1))
+
+
+def test_threshold_fallback_alone_is_optimal():
+    # Without library predicates every question is "greater than", and still optimal.
+    tree = build_tree(-6, 6, predicates=())
+    assert [tree.classify(n) for n in range(-6, 7)] == list(range(-6, 7))
+    assert tree.expected_questions() * 13 == pytest.approx(min_total_depth(13))
+    assert all(tree.is_leaf(i) or tree.predicate(i).key.startswith("gt") for i in range(len(tree)))
+
+
+def test_empty_range_is_rejected():
+    with pytest.raises(ValueError):
+        build_tree(5, 4)
+
+
+def test_number_tree_identifies_one_to_nine():
+    assert [NUMBER_TREE.classify(n) for n in range(1, 10)] == list(range(1, 10))
+    assert max(len(NUMBER_TREE.answers_for(n)) for n in range(1, 10)) <= 5
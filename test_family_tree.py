@@ -0,0 +1,327 @@
+"""Regression suite: got.FamilyTree against the original dict-based got_app helpers.
+
+The reference functions below are the module-level helpers got_app used to run
+on (over the raw JSON dict) before it moved onto FamilyTree.  Every name and
+every ordered pair in the bundled JSON must get the same answer from both.
+Kinship coefficients are checked against the plain pairwise recursion, and
+the streaming JSON reader against ``json.load``.
+"""
+
+import json
+import os
+from collections import deque
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from got import FamilyTree, iter_json_records
+from kinship import KinshipCoefficients
+from synthetic_tree import synthetic_tree
+
+JSON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_of_thrones_family_tree.json")
+
+with open(JSON_PATH, "r", encoding="utf-8") as f:
+    family_tree = json.load(f)
+
+NAMES = sorted(family_tree)
+PAIRS = list(product(NAMES, NAMES))
+
+
+# Reference implementation (original got_app helpers)
+def get_parents(name: str) -> List[str]:
+    if name not in family_tree:
+        return []
+    return family_tree[name].get("parents", [])
+
+
+def get_children(name: str) -> List[str]:
+    if name not in family_tree:
+        return []
+    return family_tree[name].get("children", [])
+
+
+def get_siblings(name: str) -> List[str]:
+    parents = get_parents(name)
+    if not parents:
+        return []
+    siblings = set()
+    for parent in parents:
+        siblings.update(get_children(parent))
+    siblings.discard(name)
+    return sorted(siblings)
+
+
+def _walk(name: str, step, max_generations: Optional[int] = None) -> Dict[str, int]:
+    if name not in family_tree:
+        return {}
+    results = {}
+    queue = deque([(name, 0)])
+    visited = {name}
+    while queue:
+        current, dist = queue.popleft()
+        if max_generations is not None and dist >= max_generations:
+            continue
+        for nb in step(current):
+            if nb not in visited:
+                visited.add(nb)
+                results[nb] = dist + 1
+                queue.append((nb, dist + 1))
+    return results
+
+
+def get_ancestors(name: str, max_generations: Optional[int] = None) -> Dict[str, int]:
+    return _walk(name, get_parents, max_generations)
+
+
+def get_descendants(name: str, max_generations: Optional[int] = None) -> Dict[str, int]:
+    return _walk(name, get_children, max_generations)
+
+
+def find_common_ancestor(name1: str, name2: str) -> Optional[Tuple[str, int, int]]:
+    ancestors1 = get_ancestors(name1)
+    ancestors2 = get_ancestors(name2)
+    best = None
+    for ancestor in set(ancestors1) & set(ancestors2):
+        total = ancestors1[ancestor] + ancestors2[ancestor]
+        if best is None or total < best[1] + best[2]:
+            best = (ancestor, ancestors1[ancestor], ancestors2[ancestor])
+    return best
+
+
+def get_relationship(name1: str, name2: str) -> Tuple:
+    """The original get_relationship checks, as FamilyTree.relationship tuples."""
+    if name1 not in family_tree or name2 not in family_tree:
+        return ("unknown",)
+    if name1 == name2:
+        return ("same",)
+    if name2 in get_parents(name1):
+        return ("parent",)
+    if name2 in get_children(name1):
+        return ("child",)
+    if name2 in get_siblings(name1):
+        return ("sibling",)
+    ancestors1 = get_ancestors(name1)
+    if name2 in ancestors1:
+        return ("ancestor", ancestors1[name2])
+    descendants1 = get_descendants(name1)
+    if name2 in descendants1:
+        return ("descendant", descendants1[name2])
+    common = find_common_ancestor(name1, name2)
+    if common:
+        return ("common_ancestor",) + common
+    return ("none",)
+
+
+def assert_same_common_ancestor(name1: str, name2: str, got, want):
+    # Several ancestors can tie at the closest total distance, and the two
+    # implementations need not pick the same one: check that the chosen one is
+    # common to both people, at their true distances, with the minimal total.
+    if want is None:
+        assert got is None, (name1, name2)
+        return
+    assert got is not None, (name1, name2)
+    ancestor, d1, d2 = got
+    assert get_ancestors(name1).get(ancestor) == d1, (name1, name2, got)
+    assert get_ancestors(name2).get(ancestor) == d2, (name1, name2, got)
+    assert d1 + d2 == want[1] + want[2], (name1, name2, got, want)
+
+
+def assert_same_relationship(name1: str, name2: str, got: Tuple, want: Tuple):
+    if want[0] == "common_ancestor":
+        assert got[0] == "common_ancestor", (name1, name2, got, want)
+        assert_same_common_ancestor(name1, name2, got[1:], want[1:])
+    else:
+        assert got == want, (name1, name2)
+
+
+@pytest.fixture(scope="module", params=["json", "reachability_index", "snapshot"])
+def tree(request, tmp_path_factory):
+    ft = FamilyTree(reachability_index=request.param == "reachability_index")
+    ft.load_json(JSON_PATH)
+    if request.param == "snapshot":
+        path = str(tmp_path_factory.mktemp("snap") / "tree.snap")
+        ft.save_snapshot(path)
+        ft = FamilyTree.open_snapshot(path)
+    return ft
+
+
+def test_names(tree):
+    assert sorted(tree.names()) == NAMES
+
+
+@pytest.mark.parametrize("name", NAMES + ["Nobody"])
+def test_single_name_queries(tree, name):
+    assert tree.get_parents(name) == get_parents(name)
+    assert sorted(tree.get_children(name)) == sorted(get_children(name))
+    assert tree.get_siblings(name) == get_siblings(name)
+    assert tree.get_ancestors(name) == get_ancestors(name)
+    assert tree.get_descendants(name) == get_descendants(name)
+    for max_gen in (1, 2, 3):
+        assert tree.get_ancestors(name, max_gen) == get_ancestors(name, max_gen)
+        assert tree.get_descendants(name, max_gen) == get_descendants(name, max_gen)
+
+
+@pytest.mark.parametrize("name", [None, "Nobody", "", 5])
+def test_missing_names(tree, name):
+    # Dropdowns with allow_custom_value can send None or arbitrary text
+    assert name not in tree
+    assert tree.get_parents(name) == []
+    assert tree.get_children(name) == []
+    assert tree.get_siblings(name) == []
+    assert tree.get_ancestors(name) == {}
+    assert tree.get_descendants(name) == {}
+    assert tree.find_common_ancestor(name, NAMES[0]) is None
+    assert tree.relationship(name, NAMES[0]) == ("unknown",)
+    assert tree.relationship(NAMES[0], name) == ("unknown",)
+
+
+def test_many_name_sweeps(tree):
+    names = NAMES + ["Nobody"]
+    assert tree.ancestors_of_many(names) == {n: get_ancestors(n) for n in names}
+    assert tree.descendants_of_many(names) == {n: get_descendants(n) for n in names}
+    assert tree.ancestors_of_many(names, 2) == {n: get_ancestors(n, 2) for n in names}
+
+
+def test_ancestor_checks(tree):
+    for name1, name2 in PAIRS:
+        want = get_ancestors(name1).get(name2)
+        assert tree.is_ancestor(name2, name1) == (want is not None), (name1, name2)
+        assert tree.ancestor_distance(name1, name2) == want, (name1, name2)
+
+
+def test_common_ancestor(tree):
+    for name1, name2 in PAIRS:
+        assert_same_common_ancestor(name1, name2, tree.find_common_ancestor(name1, name2),
+                                    find_common_ancestor(name1, name2))
+
+
+def test_relationship(tree):
+    for name1, name2 in PAIRS + [("Nobody", NAMES[0]), (NAMES[0], "Nobody")]:
+        assert_same_relationship(name1, name2, tree.relationship(name1, name2), get_relationship(name1, name2))
+
+
+def test_relationships_batch(tree):
+    pairs = PAIRS + [("Nobody", NAMES[0])]
+    for (name1, name2), got in zip(pairs, tree.relationships(pairs)):
+        assert_same_relationship(name1, name2, got, get_relationship(name1, name2))
+
+
+def reference_kinship(tree: FamilyTree, a: str, b: str, memo: Dict) -> float:
+    """The pairwise recursion on the later-born person, memoised on name pairs."""
+    if (a, b) in memo:
+        return memo[a, b]
+    if a == b:
+        parents = tree.get_parents(a)
+        phi = 0.5 * (1 + (reference_kinship(tree, *parents, memo) if len(parents) == 2 else 0))
+    else:
+        if (tree.get_generation(a), a) < (tree.get_generation(b), b):
+            a, b = b, a
+        parents = tree.get_parents(a)
+        phi = sum(reference_kinship(tree, p, b, memo) for p in parents) / max(2, len(parents))
+    memo[a, b] = memo[b, a] = phi
+    return phi
+
+
+def test_kinship_coefficients(tree):
+    coefficients = KinshipCoefficients(tree)
+    memo: Dict = {}
+    for name1, name2 in PAIRS:
+        assert coefficients.kinship(name1, name2) == pytest.approx(reference_kinship(tree, name1, name2, memo))
+    for name in NAMES:
+        assert coefficients.inbreeding(name) == pytest.approx(2 * reference_kinship(tree, name, name, memo) - 1)
+    assert coefficients.kinship("Nobody", NAMES[0]) is None
+    assert coefficients.inbreeding(None) is None
+
+
+def test_kinship_memo_stays_per_person():
+    # Far ends of the latest generation of an interbred synthetic pedigree:
+    # the memo may hold one entry per shared ancestor, never one per pair.
+    ft = synthetic_tree(3000, collapse=0.2, seed=1)
+    names = ft.names()
+    latest = [x for x in names if ft.get_generation(x) == max(map(ft.get_generation, names))]
+    a, b = latest[0], latest[-1]
+    coefficients = KinshipCoefficients(ft)
+    memo: Dict = {}
+    assert coefficients.kinship(a, b) == pytest.approx(reference_kinship(ft, a, b, memo))
+    shared = (set(ft.get_ancestors(a)) | {a}) & (set(ft.get_ancestors(b)) | {b})
+    assert len(coefficients) == len(shared) < len(memo) / 10
+    ft.add_person("Outsider")
+    assert coefficients.kinship(a, "Outsider") == 0
+
+
+# Streaming loader: chunk boundaries may fall anywhere, including inside
+# whitespace runs, strings, escapes, multi-byte characters and bare numbers.
+TRICKY = {
+    "Aegon \"the Unworthy\" Targaryen": {"parents": ["Viserys II"], "children": [], "meta": {"born": 135}},
+    "Daenerys Stormborn \u00e9\u4e16": {"parents": [], "children": [], "meta": {"title": "M\u00e8re des \U0001f409"}},
+    "Viserys II": {"parents": [], "children": ["Aegon \"the Unworthy\" Targaryen"], "meta": {"reign": [171, 172.5, -1e3]}},
+    "": {"parents": [], "children": [], "meta": {"flag": True, "none": None, "false": False}},
+}
+
+
+def _write(path, text: str) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def json_files(tmp_path_factory):
+    d = tmp_path_factory.mktemp("json")
+    with open(JSON_PATH, "r", encoding="utf-8") as f:
+        bundled = f.read()
+    return [
+        JSON_PATH,
+        _write(d / "compact.json", json.dumps(family_tree, separators=(",", ":"), ensure_ascii=False)),
+        _write(d / "tricky.json", json.dumps(TRICKY, ensure_ascii=False)),
+        _write(d / "tricky_escaped.json", json.dumps(TRICKY, ensure_ascii=True)),
+        _write(d / "spaced.json", " \n\t{ " + json.dumps(TRICKY, indent=7).strip()[1:-1].replace(",", " \r\n ,   ") + "\n\n }  \n"),
+        _write(d / "bare_number_last.json", '{"a": {"meta": {"n": 1234567}}, "b": 12345678901234}'),
+        _write(d / "empty.json", " {  } "),
+        _write(d / "bundled_crlf.json", bundled.replace("\n", "\r\n")),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+def test_streaming_json_matches_json_load(json_files, chunk_size):
+    for path in json_files:
+        with open(path, "r", encoding="utf-8") as f:
+            want = json.load(f)
+        got = list(iter_json_records(path, chunk_size=chunk_size))
+        assert [name for name, _ in got] == list(want), path
+        assert dict(got) == want, path
+
+
+def test_streaming_json_rejects_truncated_input(tmp_path):
+    path = _write(tmp_path / "cut.json", json.dumps(TRICKY)[:-5])
+    with pytest.raises(ValueError):
+        list(iter_json_records(path, chunk_size=7))
+
+
+def test_jsonl_matches_json(tmp_path):
+    ft = FamilyTree()
+    ft.load_json(JSON_PATH)
+    jsonl = str(tmp_path / "tree.jsonl")
+    ft.save_jsonl(jsonl)
+    with open(jsonl, "r", encoding="utf-8") as f:
+        want = {rec.pop("name"): rec for rec in map(json.loads, f)}
+    assert dict(iter_json_records(jsonl)) == want
+    reloaded = FamilyTree()
+    reloaded.load_json(jsonl)
+    assert _records(reloaded) == _records(ft)
+
+
+def _records(ft: FamilyTree) -> Dict[str, Tuple]:
+    # Ids (and so children order) follow first mention, which differs by format
+    return {name: (rec["parents"], sorted(rec["children"]), rec["meta"]) for name, rec in ft.iter_records()}
+
+
+def test_load_json_matches_load_dict(json_files):
+    for path in json_files[:2]:
+        streamed = FamilyTree()
+        streamed.load_json(path)
+        with open(path, "r", encoding="utf-8") as f:
+            loaded = FamilyTree()
+            loaded.load_dict(json.load(f))
+        assert _records(streamed) == _records(loaded)
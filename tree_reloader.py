@@ -0,0 +1,79 @@
+import os
+import sys
+import threading
+from typing import Callable, Optional, Tuple
+
+from got import FamilyTree
+
+
+class TreeReloader:
+    """Watch a data file and swap in a freshly built FamilyTree when it changes.
+
+    ``load()`` runs on a background thread, so parsing and index building never
+    happen on the request path; the finished tree is published with a single
+    reference assignment (``on_swap``), so readers see either the old tree or
+    the new one, never a half-built one. A failed load keeps the old tree and
+    is retried once the file changes again.
+    """
+
+    def __init__(self, path: str, load: Callable[[], FamilyTree], tree: FamilyTree,
+                 on_swap: Optional[Callable[[FamilyTree], None]] = None, interval: float = 2.0):
+        self.path = path
+        self.interval = interval
+        self._load = load
+        self._on_swap = on_swap
+        self._tree = tree
+        self._seen = self._signature()
+        self._failed: Optional[Tuple[int, int]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reloads = 0
+
+    @property
+    def tree(self) -> FamilyTree:
+        return self._tree
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def check(self) -> bool:
+        """Reload now if the file changed since the last load; True if a new tree was swapped in."""
+        before = self._signature()
+        if before is None or before == self._seen or before == self._failed:
+            return False
+        try:
+            new_tree = self._load()
+        except (OSError, ValueError) as e:
+            print(f"Reloading {self.path} failed, keeping the current tree: {e}", file=sys.stderr)
+            self._failed = before
+            return False
+        if self._signature() != before:
+            # Still being written; pick it up once it settles.
+            return False
+        self._seen = before
+        self._tree = new_tree
+        self.reloads += 1
+        if self._on_swap is not None:
+            self._on_swap(new_tree)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> "TreeReloader":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="tree-reloader", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None